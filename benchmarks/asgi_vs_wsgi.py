@@ -0,0 +1,128 @@
+"""Пропускная способность лент под параллельными клиентами: WSGI
+с синхронными представлениями против ASGI с асинхронными (SQLite).
+
+    python -m benchmarks.datagen --posts 10000 --reset
+    python -m benchmarks.asgi_vs_wsgi --clients 16 --requests 400
+
+Каждый режим запускается в отдельном процессе: выбор представлений
+(BLOGICUM_ASYNC_VIEWS) фиксируется при загрузке URLconf.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+
+from benchmarks.common import ROOT, git_revision, setup, summarize
+
+MODES = {'wsgi': '0', 'asgi': '1'}
+
+
+def get_urls(n_requests):
+    from benchmarks.run_views import get_targets
+
+    targets = get_targets()
+    targets.pop('total_posts')
+    urls = [url for url in targets.values() if url]
+    return list(islice(cycle(urls), n_requests))
+
+
+def run_wsgi(urls, clients):
+    from django.db import connections
+    from django.test import Client
+
+    def worker(chunk):
+        client, latencies = Client(), []
+        for url in chunk:
+            started = time.perf_counter()
+            response = client.get(url)
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, (url, response.status_code)
+        connections.close_all()
+        return latencies
+
+    chunks = [urls[number::clients] for number in range(clients)]
+    with ThreadPoolExecutor(clients) as executor:
+        return [
+            latency
+            for latencies in executor.map(worker, chunks)
+            for latency in latencies
+        ]
+
+
+def run_asgi(urls, clients):
+    from django.test import AsyncClient
+
+    async def worker(chunk):
+        client, latencies = AsyncClient(), []
+        for url in chunk:
+            started = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, (url, response.status_code)
+        return latencies
+
+    async def run():
+        chunks = [urls[number::clients] for number in range(clients)]
+        results = await asyncio.gather(*map(worker, chunks))
+        return [latency for latencies in results for latency in latencies]
+
+    return asyncio.run(run())
+
+
+def measure(mode, clients, n_requests):
+    setup()
+    urls = get_urls(n_requests)
+    runner = run_asgi if mode == 'asgi' else run_wsgi
+    runner(urls[:clients], clients)
+    started = time.perf_counter()
+    latencies = runner(urls, clients)
+    elapsed = time.perf_counter() - started
+    return {
+        'mode': mode,
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 1),
+        **summarize(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--output', help='Куда сохранить результаты (JSON).')
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.clients, args.requests)))
+        return
+
+    results = {'revision': git_revision(), 'clients': args.clients}
+    for mode, async_views in MODES.items():
+        completed = subprocess.run(
+            [
+                sys.executable, '-m', 'benchmarks.asgi_vs_wsgi',
+                '--mode', mode, '--clients', str(args.clients),
+                '--requests', str(args.requests),
+            ],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+            env={**os.environ, 'BLOGICUM_ASYNC_VIEWS': async_views},
+        )
+        result = json.loads(completed.stdout.splitlines()[-1])
+        results[mode] = result
+        print(
+            f'{mode}: {result["rps"]:8.1f} req/s  '
+            f'p50 {result["p50_ms"]:8.2f} ms  p99 {result["p99_ms"]:8.2f} ms'
+        )
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(results, output, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Время рендера ленты без кэша карточек и с прогретым кэшем карточек.
+
+    python -m benchmarks.card_cache [--repeat 300] [--posts 10 100]
+
+В настройках бенчмарков кэш отключён (DummyCache), так что первый
+вариант — это рендер каждой карточки плюс накладные расходы тега
+{% cache %}; второй — то же на локальном кэше, где все карточки уже
+отрендерены.
+"""
+import argparse
+import timeit
+from datetime import datetime, timezone
+
+from benchmarks.template_render import make_engine, make_page, render_feed
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, override_settings
+
+LOCAL_CACHE = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
+
+def measure(engine, request, page, repeat):
+    render_feed(engine, request, page)
+    seconds = timeit.timeit(
+        lambda: render_feed(engine, request, page), number=repeat
+    )
+    return seconds / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=300)
+    parser.add_argument('--posts', type=int, nargs='+', default=[10, 100])
+    args = parser.parse_args()
+
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    engine = make_engine(cached=True)
+    for n_posts in args.posts:
+        page = make_page(n_posts)
+        for post in page:
+            post.updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        uncached = measure(engine, request, page, args.repeat)
+        with override_settings(CACHES=LOCAL_CACHE):
+            cached = measure(engine, request, page, args.repeat)
+        print(
+            f'{n_posts:>4} карточек: без кэша {uncached:7.3f} ms, '
+            f'с кэшем {cached:7.3f} ms, '
+            f'экономия {uncached - cached:7.3f} ms на рендер'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+r"""Задержка лент на SQLite и PostgreSQL на одинаковых данных.
+
+    POSTGRES_DB=blogicum_bench python -m benchmarks.compare_backends \\
+        --posts 20000 --requests 50
+
+Для каждого движка база заполняется заново (datagen --reset), затем
+run_views измеряет страницы. PostgreSQL пропускается, если сервер
+из POSTGRES_* недоступен.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import ROOT, setup
+
+ENGINES = ('sqlite', 'postgresql')
+
+
+def run(module, engine, *args):
+    subprocess.run(
+        [sys.executable, '-m', module, *args],
+        cwd=ROOT, check=True,
+        env={**os.environ, 'BLOGICUM_DB_ENGINE': engine},
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=30)
+    args = parser.parse_args()
+
+    setup()
+    from blogicum.database import postgresql_available, postgresql_database
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for engine in ENGINES:
+            if engine == 'postgresql' and not postgresql_available(
+                postgresql_database()
+            ):
+                print('PostgreSQL недоступен, пропускаю.')
+                continue
+            output = Path(directory) / f'{engine}.json'
+            run(
+                'benchmarks.datagen', engine,
+                '--posts', str(args.posts), '--reset'
+            )
+            run(
+                'benchmarks.run_views', engine,
+                '--requests', str(args.requests), '--output', str(output)
+            )
+            results[engine] = json.loads(output.read_text(encoding='utf-8'))
+
+    views = {view for result in results.values() for view in result['views']}
+    for view in sorted(views):
+        row = '  '.join(
+            f'{engine} {result["views"][view]["p50_ms"]:8.2f} ms'
+            for engine, result in results.items()
+            if view in result['views']
+        )
+        print(f'{view:>15}: {row}')
+
+
+if __name__ == '__main__':
+    main()
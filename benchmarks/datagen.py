@@ -0,0 +1,135 @@
+"""Детерминированный генератор большой базы для бенчмарков.
+
+    python -m benchmarks.datagen --posts 100000 [--seed 0] [--reset]
+
+Одинаковые --posts и --seed всегда дают одинаковые данные: авторы
+с перекошенным числом публикаций, комментарии с тяжёлым хвостом
+(немного публикаций собирают большую часть обсуждений), небольшая
+доля отложенных и скрытых публикаций.
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import setup
+
+N_CATEGORIES = 6
+N_LOCATIONS = 12
+MAX_COMMENTS_PER_POST = 1000
+BASE_DATE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def comments_for_post(rnd):
+    return min(int(rnd.paretovariate(1.5)) - 1, MAX_COMMENTS_PER_POST)
+
+
+def generate(n_posts, seed=0, batch_size=5000, log=print):
+    from django.contrib.auth import get_user_model
+    from django.db import transaction
+
+    from blog.models import Category, Comment, Location, Post
+
+    rnd = random.Random(seed)
+    User = get_user_model()
+    started = time.perf_counter()
+
+    n_authors = max(10, n_posts // 50)
+    User.objects.bulk_create(
+        User(username=f'author{i}', password='!') for i in range(n_authors)
+    )
+    author_ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+    categories = Category.objects.bulk_create(
+        Category(
+            title=f'Категория {i}', slug=f'category-{i}',
+            description='Описание категории',
+            is_published=i != N_CATEGORIES - 1,
+        )
+        for i in range(N_CATEGORIES)
+    )
+    locations = Location.objects.bulk_create(
+        Location(name=f'Место {i}') for i in range(N_LOCATIONS)
+    )
+    now = datetime.now(timezone.utc)
+
+    n_comments = 0
+    for start in range(0, n_posts, batch_size):
+        posts, counts = [], []
+        for i in range(start, min(start + batch_size, n_posts)):
+            future = rnd.random() < 0.02
+            pub_date = (
+                now + timedelta(days=rnd.randint(1, 30)) if future
+                else BASE_DATE + timedelta(minutes=i)
+            )
+            is_published = rnd.random() < 0.97
+            count = comments_for_post(rnd)
+            counts.append(count)
+            posts.append(Post(
+                title=f'Публикация {i}',
+                text=' '.join(['Текст публикации номер', str(i)] * 20),
+                pub_date=pub_date,
+                author_id=author_ids[int(n_authors * rnd.random() ** 3)],
+                category=rnd.choice(categories),
+                location=rnd.choice(locations) if rnd.random() < 0.8 else None,
+                is_published=is_published,
+                is_visible=is_published and not future,
+                comment_count=count,
+            ))
+        with transaction.atomic():
+            Post.objects.bulk_create(posts)
+            Comment.objects.bulk_create(
+                (
+                    Comment(
+                        post=post, author_id=rnd.choice(author_ids),
+                        text=f'Комментарий {n}'
+                    )
+                    for post, count in zip(posts, counts)
+                    for n in range(count)
+                ),
+                batch_size=batch_size
+            )
+        n_comments += sum(counts)
+        log(f'{start + len(posts)}/{n_posts} публикаций')
+
+    log(
+        f'Готово: {n_posts} публикаций, {n_comments} комментариев, '
+        f'{n_authors} авторов за {time.perf_counter() - started:.1f} с'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument(
+        '--reset', action='store_true',
+        help='Удалить базу бенчмарков перед генерацией.'
+    )
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+
+    if args.reset:
+        connection.close()
+        database = settings.DATABASES['default']['NAME']
+        if connection.vendor == 'sqlite':
+            if database != settings.BENCH_DB:
+                parser.error(
+                    f'--reset удаляет только базу бенчмарков '
+                    f'{settings.BENCH_DB}, а не {database}.'
+                )
+            if os.path.exists(database):
+                os.remove(database)
+        else:
+            call_command('flush', interactive=False, verbosity=0)
+    call_command('migrate', verbosity=0)
+    generate(args.posts, seed=args.seed, batch_size=args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Лента с JOIN категорий и местоположений и со справочниками в памяти.
+
+    python -m benchmarks.datagen --posts 100000 --reset
+    python -m benchmarks.lookup_tables [--repeat 200] [--rows 1000]
+
+Для каждого варианта печатаются средний объём одной строки результата
+(сумма длин значений всех колонок в байтах), задержка страницы ленты
+из NUM_OF_POSTS публикаций и выборки из --rows публикаций.
+"""
+import argparse
+import time
+
+from benchmarks.common import setup, summarize
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from blog.lookups import get_lookup_tables  # noqa: E402
+from blog.models import Post  # noqa: E402
+from blog.query_func import get_optimized_queryset  # noqa: E402
+
+
+def joined_queryset():
+    """Запрос лент до справочников в памяти."""
+    return Post.objects.select_related(
+        'category', 'author', 'location'
+    ).filter(is_visible=True, category__is_published=True)
+
+
+def bytes_per_row(queryset, rows):
+    sql, params = queryset[:rows].query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        fetched = cursor.fetchall()
+    total = sum(
+        len(value if isinstance(value, bytes) else str(value).encode())
+        for row in fetched for value in row if value is not None
+    )
+    return total / max(len(fetched), 1)
+
+
+def measure(make_queryset, rows, repeat):
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for post in make_queryset()[:rows]:
+            post.category.title, post.location and post.location.name
+        latencies.append(time.perf_counter() - started)
+    return summarize(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--rows', type=int, default=1000)
+    args = parser.parse_args()
+
+    get_lookup_tables()
+    variants = (('join', joined_queryset), ('lookups', get_optimized_queryset))
+    for name, make_queryset in variants:
+        size = bytes_per_row(make_queryset(), args.rows)
+        page = measure(make_queryset, settings.NUM_OF_POSTS, args.repeat)
+        bulk = measure(make_queryset, args.rows, max(args.repeat // 10, 1))
+        print(
+            f'{name:>8}: {size:7.1f} байт/строка  '
+            f'лента p50 {page["p50_ms"]:7.3f} ms  '
+            f'{args.rows} строк p50 {bulk["p50_ms"]:8.3f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""Задержка, число запросов к базе и объём ответа горячих страниц.
+
+    python -m benchmarks.datagen --posts 100000 --reset
+    python -m benchmarks.run_views --requests 50 --output bench.json
+    python -m benchmarks.run_views --compare bench.json
+
+Результаты пишутся в JSON, чтобы сравнивать их между коммитами.
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+
+from benchmarks.common import git_revision, setup, summarize
+
+
+def get_targets():
+    """URL горячих страниц на сгенерированных данных."""
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count
+
+    from blog.models import Category, Post
+    from blog.query_func import get_optimized_queryset
+
+    visible = get_optimized_queryset()
+    n_pages = max(1, visible.count() // settings.NUM_OF_POSTS)
+    post = visible.order_by('-comment_count').first()
+    category = Category.objects.filter(is_published=True).order_by('pk')[0]
+    author = get_user_model().objects.annotate(
+        n_posts=Count('posts')
+    ).order_by('-n_posts').first()
+    return {
+        'index': '/',
+        'index_deep': f'/?page={n_pages // 2 or 1}',
+        'post_detail': f'/posts/{post.pk}/' if post else None,
+        'category_posts': f'/category/{category.slug}/',
+        'profile': f'/profile/{author.username}/',
+        'total_posts': Post.objects.count(),
+    }
+
+
+def measure(client, url, n_requests, warmup=3):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    for _ in range(warmup):
+        client.get(url)
+    latencies, queries, sql_seconds = [], [], []
+    for _ in range(n_requests):
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url)
+            latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, (url, response.status_code)
+        queries.append(len(captured.captured_queries))
+        sql_seconds.append(
+            sum(float(q['time']) for q in captured.captured_queries)
+        )
+    # Число запросов и время SQL — средние на запрос по всем замерам,
+    # как и перцентили задержки.
+    return {
+        'url': url,
+        **summarize(latencies),
+        'queries': round(sum(queries) / n_requests, 2),
+        'queries_max': max(queries),
+        'sql_ms': round(sum(sql_seconds) / n_requests * 1000, 3),
+        'bytes': len(response.content),
+    }
+
+
+def compare(old, new):
+    for view, result in new['views'].items():
+        before = old['views'].get(view)
+        if before is None:
+            continue
+        ratio = result['p50_ms'] / before['p50_ms'] if before['p50_ms'] else 0
+        print(
+            f'{view:>15}: p50 {before["p50_ms"]:.2f} -> '
+            f'{result["p50_ms"]:.2f} ms (x{ratio:.2f}), '
+            f'queries {before["queries"]} -> {result["queries"]}'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=30)
+    parser.add_argument('--output', help='Куда сохранить результаты (JSON).')
+    parser.add_argument('--compare', help='Сравнить с сохранённым JSON.')
+    parser.add_argument(
+        '--cache', action='store_true',
+        help='Включить локальный кэш вместо DummyCache.'
+    )
+    parser.add_argument(
+        '--only', nargs='*', help='Измерить только указанные страницы.'
+    )
+    args = parser.parse_args()
+
+    setup()
+    from django.test import Client, override_settings
+
+    caches = {'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+    }} if args.cache else None
+    with override_settings(**({'CACHES': caches} if caches else {})):
+        targets = get_targets()
+        total_posts = targets.pop('total_posts')
+        client = Client()
+        views = {
+            view: measure(client, url, args.requests)
+            for view, url in targets.items()
+            if url and (not args.only or view in args.only)
+        }
+
+    results = {
+        'revision': git_revision(),
+        'created': datetime.now(timezone.utc).isoformat(),
+        'posts': total_posts,
+        'requests': args.requests,
+        'cache': args.cache,
+        'views': views,
+    }
+    for view, result in views.items():
+        print(
+            f'{view:>15}: p50 {result["p50_ms"]:8.2f} ms  '
+            f'p99 {result["p99_ms"]:8.2f} ms  '
+            f'{result["queries"]:6.2f} queries/request  '
+            f'{result["bytes"]:8d} bytes'
+        )
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(results, output, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as previous:
+            compare(json.load(previous), results)
+
+
+if __name__ == '__main__':
+    main()
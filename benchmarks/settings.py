@@ -0,0 +1,32 @@
+"""Настройки для бенчмарков: отдельная база, без debug_toolbar."""
+import os
+import tempfile
+
+from blogicum.settings import *  # noqa: F401, F403
+from blogicum.database import get_databases
+from blogicum.settings import BASE_DIR, INSTALLED_APPS, MIDDLEWARE
+
+DEBUG = False
+ALLOWED_HOSTS = ['testserver', 'localhost']
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'debug_toolbar']
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if not middleware.startswith('debug_toolbar')
+]
+
+# SQLite — всегда отдельный файл BENCH_DB (и при BLOGICUM_DB_ENGINE=auto
+# без сервера), чтобы datagen --reset не удалил базу разработчика;
+# PostgreSQL берётся из тех же переменных окружения, что и у проекта.
+BENCH_DB = os.getenv(
+    'BENCH_DB', os.path.join(tempfile.gettempdir(), 'blogicum-bench.sqlite3')
+)
+DATABASES = get_databases(BASE_DIR, {**os.environ, 'SQLITE_PATH': BENCH_DB})
+
+# Кэш страниц отключён, чтобы измерять сами представления;
+# run_views.py --cache включает локальный кэш.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    }
+}
@@ -0,0 +1,85 @@
+"""Время рендера страницы ленты из 10 публикаций с кэширующим загрузчиком
+шаблонов и без него.
+
+    python -m benchmarks.template_render [--repeat 500]
+"""
+import argparse
+import timeit
+from datetime import datetime, timezone
+
+from benchmarks.common import setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.contrib.auth.models import AnonymousUser  # noqa: E402
+from django.template.backends.django import DjangoTemplates  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from blog.models import Category, Location, Post  # noqa: E402
+
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def make_engine(cached):
+    config = settings.TEMPLATES[0]
+    return DjangoTemplates({
+        'NAME': 'cached' if cached else 'filesystem',
+        'DIRS': config['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **config['OPTIONS'],
+            'loaders': (
+                [('django.template.loaders.cached.Loader', LOADERS)]
+                if cached else LOADERS
+            ),
+        },
+    })
+
+
+def make_page(n_posts):
+    author = get_user_model()(id=1, username='author')
+    category = Category(
+        id=1, title='Категория', slug='category', is_published=True
+    )
+    location = Location(id=1, name='Место', is_published=True)
+    return [
+        Post(
+            id=i, title=f'Публикация {i}', text='Текст публикации ' * 30,
+            pub_date=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            author=author, category=category, location=location,
+            is_published=True, comment_count=i,
+        )
+        for i in range(1, n_posts + 1)
+    ]
+
+
+def render_feed(engine, request, page):
+    template = engine.get_template('blog/index.html')
+    return template.render({'page_obj': page}, request)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=500)
+    parser.add_argument('--posts', type=int, default=settings.NUM_OF_POSTS)
+    args = parser.parse_args()
+
+    request = RequestFactory().get('/')
+    request.user = AnonymousUser()
+    page = make_page(args.posts)
+    for name, cached in (('filesystem', False), ('cached', True)):
+        engine = make_engine(cached)
+        render_feed(engine, request, page)
+        seconds = timeit.timeit(
+            lambda: render_feed(engine, request, page), number=args.repeat
+        )
+        print(f'{name:>10}: {seconds / args.repeat * 1000:.3f} ms/render')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Post, Category, Location, Comment
+from .models import Post, Category, Location, Comment, ImageJob
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -31,7 +31,14 @@ class CommentAdmin(admin.ModelAdmin):
     list_filter = ('created_at', 'post',)
 
 
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = ('post', 'status', 'attempts', 'updated_at',)
+    list_filter = ('status',)
+    readonly_fields = ('post', 'attempts', 'last_error',)
+
+
 admin.site.register(Post, PostAdmin)
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Location, LocationAdmin)
 admin.site.register(Comment, CommentAdmin)
+admin.site.register(ImageJob, ImageJobAdmin)
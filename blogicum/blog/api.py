@@ -0,0 +1,191 @@
+"""JSON API только для чтения: публикации, комментарии, категории.
+
+Поля каждого ресурса описаны словарём «имя -> функция», параметр
+?fields= выбирает их подмножество. Все связанные объекты, которые
+нужны функциям полей, должны загружаться select_related/
+prefetch_related в запросе представления: тесты tests/test_api.py
+проверяют, что число запросов не растёт с числом записей.
+"""
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_GET
+
+from .models import Category, Comment, Post
+from .paginate import get_cursor_page
+from .query_func import (
+    get_detail_queryset, get_optimized_queryset, is_post_visible
+)
+
+POST_FIELDS = {
+    'id': lambda post, request: post.pk,
+    'url': lambda post, request: request.build_absolute_uri(
+        reverse('blog:api_post_detail', args=[post.pk])
+    ),
+    'title': lambda post, request: post.title,
+    'text': lambda post, request: post.text,
+    'pub_date': lambda post, request: post.pub_date,
+    'updated_at': lambda post, request: post.updated_at,
+    'author': lambda post, request: post.author.username,
+    'category': lambda post, request: (
+        post.category.slug if post.category else None
+    ),
+    'location': lambda post, request: (
+        post.location.name
+        if post.location and post.location.is_published else None
+    ),
+    'image': lambda post, request: (
+        request.build_absolute_uri(post.image.url) if post.image else None
+    ),
+    'comment_count': lambda post, request: post.comment_count,
+}
+
+COMMENT_FIELDS = {
+    'id': lambda comment, request: comment.pk,
+    'text': lambda comment, request: comment.text,
+    'author': lambda comment, request: comment.author.username,
+    'created_at': lambda comment, request: comment.created_at,
+}
+
+POST_DETAIL_FIELDS = {
+    **POST_FIELDS,
+    'comments': lambda post, request: [
+        serialize(comment, COMMENT_FIELDS, request)
+        for comment in post.comments.all()
+    ],
+}
+
+CATEGORY_FIELDS = {
+    'slug': lambda category, request: category.slug,
+    'title': lambda category, request: category.title,
+    'description': lambda category, request: category.description,
+    'updated_at': lambda category, request: category.updated_at,
+}
+
+
+class FieldsError(ValueError):
+    pass
+
+
+def get_fields(request, available):
+    """Поля из ?fields=id,title или все поля ресурса."""
+    requested = request.GET.get('fields')
+    if not requested:
+        return available
+    names = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise FieldsError(f'Неизвестные поля: {", ".join(unknown)}')
+    return {name: available[name] for name in names}
+
+
+def serialize(obj, fields, request):
+    return {name: getter(obj, request) for name, getter in fields.items()}
+
+
+def get_limit(request):
+    try:
+        limit = int(request.GET.get('limit') or settings.API_PAGE_SIZE)
+    except ValueError:
+        limit = settings.API_PAGE_SIZE
+    return min(max(limit, 1), settings.API_MAX_PAGE_SIZE)
+
+
+def stream_page(request, page_obj, fields):
+    """Отдать страницу курсорной пагинации, сериализуя записи по одной."""
+    def build_url(cursor):
+        if cursor is None:
+            return None
+        query = request.GET.copy()
+        query['cursor'] = cursor
+        return request.build_absolute_uri(f'?{query.urlencode()}')
+
+    def chunks():
+        yield '{"results": ['
+        for number, obj in enumerate(page_obj):
+            yield (',' if number else '') + json.dumps(
+                serialize(obj, fields, request),
+                cls=DjangoJSONEncoder, ensure_ascii=False
+            )
+        yield '], ' + json.dumps({
+            'next': build_url(page_obj.next_cursor),
+            'previous': build_url(page_obj.previous_cursor),
+        })[1:]
+
+    return StreamingHttpResponse(
+        chunks(), content_type='application/json; charset=utf-8'
+    )
+
+
+def api_view(view_func):
+    """GET-only представление API: ошибки отдаются в JSON."""
+    @wraps(view_func)
+    @require_GET
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view_func(request, *args, **kwargs)
+        except FieldsError as error:
+            return JsonResponse({'detail': str(error)}, status=400)
+        except Http404:
+            return JsonResponse({'detail': 'Не найдено.'}, status=404)
+    return wrapper
+
+
+@api_view
+def post_list(request):
+    fields = get_fields(request, POST_FIELDS)
+    page_obj = get_cursor_page(
+        get_optimized_queryset(filters=True),
+        request.GET.get('cursor'), get_limit(request)
+    )
+    return stream_page(request, page_obj, fields)
+
+
+@api_view
+def author_posts(request, username):
+    fields = get_fields(request, POST_FIELDS)
+    author = get_object_or_404(get_user_model(), username=username)
+    page_obj = get_cursor_page(
+        get_optimized_queryset(
+            manager=Post.objects.filter(author=author),
+            filters=request.user != author
+        ),
+        request.GET.get('cursor'), get_limit(request)
+    )
+    return stream_page(request, page_obj, fields)
+
+
+@api_view
+def post_detail(request, post_id):
+    fields = get_fields(request, POST_DETAIL_FIELDS)
+    queryset = get_detail_queryset()
+    if 'comments' in fields:
+        queryset = queryset.prefetch_related(Prefetch(
+            'comments', queryset=Comment.objects.select_related('author')
+        ))
+    post = get_object_or_404(queryset, pk=post_id)
+    if post.author_id != request.user.pk and not is_post_visible(post):
+        raise Http404
+    return JsonResponse(
+        serialize(post, fields, request),
+        json_dumps_params={'ensure_ascii': False}
+    )
+
+
+@api_view
+def category_list(request):
+    fields = get_fields(request, CATEGORY_FIELDS)
+    categories = Category.objects.filter(is_published=True).order_by('title')
+    return JsonResponse(
+        {'results': [
+            serialize(category, fields, request) for category in categories
+        ]},
+        json_dumps_params={'ensure_ascii': False}
+    )
@@ -0,0 +1,121 @@
+"""Асинхронные версии лент и страницы публикации для ASGI.
+
+Подключаются вместо синхронных из views.py, когда BLOGICUM_ASYNC_VIEWS=1
+(так по умолчанию делает blogicum/asgi.py). Публикации читаются
+асинхронным ORM; шаблон рендерится по уже загруженным объектам, поэтому
+во время рендера к базе никто не обращается.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.http import Http404
+from django.shortcuts import render
+from django.utils.cache import get_conditional_response
+
+from .cache import cache_feed_page
+from .conditional import (
+    async_condition, category_etag, index_etag, post_etag, profile_etag
+)
+from .forms import CommentForm
+from .models import Category, Post
+from .paginate import aget_paginator
+from .query_func import (
+    aget_optimized_queryset, get_detail_queryset, is_post_visible
+)
+
+
+def _load_user(request):
+    return request.user.is_authenticated
+
+
+def load_user(view_func):
+    """Загрузить request.user заранее: SimpleLazyObject читает сессию
+    и пользователя синхронно при первом обращении.
+    """
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        await sync_to_async(_load_user)(request)
+        return await view_func(request, *args, **kwargs)
+    return wrapper
+
+
+@load_user
+@cache_feed_page
+@async_condition(etag_func=index_etag)
+async def index(request):
+    template_name = 'blog/index.html'
+    post_list = await aget_optimized_queryset(filters=True)
+    context = await aget_paginator(request, post_list)
+    return render(request, template_name, context)
+
+
+@load_user
+@cache_feed_page
+@async_condition(etag_func=category_etag)
+async def category_posts(request, category_slug):
+    template_name = 'blog/category.html'
+    try:
+        category = await Category.objects.aget(
+            slug=category_slug, is_published=True
+        )
+    except Category.DoesNotExist:
+        raise Http404
+    post_list = await aget_optimized_queryset(
+        manager=Post.objects.filter(category=category),
+        filters=True
+    )
+    context = {
+        **await aget_paginator(request, post_list),
+        'category': category
+    }
+    return render(request, template_name, context)
+
+
+@load_user
+async def post_detail(request, post_id):
+    template_name = 'blog/detail.html'
+    queryset = get_detail_queryset()
+    try:
+        post = await queryset.aget(pk=post_id)
+    except Post.DoesNotExist:
+        raise Http404
+
+    if post.author_id != request.user.pk and not is_post_visible(post):
+        raise Http404
+
+    etag = await sync_to_async(post_etag)(request, post)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    context = {
+        'post': post,
+        'comments': [
+            comment async for comment in
+            post.comments.select_related('author')
+        ],
+        'form': CommentForm()
+    }
+    response = render(request, template_name, context)
+    response['ETag'] = etag
+    return response
+
+
+@load_user
+@async_condition(etag_func=profile_etag)
+async def profile(request, username):
+    template_name = 'blog/profile.html'
+    try:
+        author = await get_user_model().objects.aget(username=username)
+    except get_user_model().DoesNotExist:
+        raise Http404
+    post_list = await aget_optimized_queryset(
+        manager=Post.objects.filter(author=author),
+        filters=request.user != author
+    )
+    context = {
+        **await aget_paginator(request, post_list),
+        'profile': author
+    }
+    return render(request, template_name, context)
@@ -0,0 +1,158 @@
+from asyncio import iscoroutinefunction
+from functools import wraps
+from math import ceil
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+
+from .models import Post
+from .paginate import CURSOR_MODE, decode_cursor
+
+
+def make_key(family, *parts):
+    """Ключ данных блога: blog:v<BLOG_CACHE_VERSION>:<семейство>:<части>.
+
+    По семейству instrumentation.CacheStats группирует попадания и
+    промахи; смена BLOG_CACHE_VERSION разом делает недействительными
+    данные блога, например после изменения формата закэшированных
+    значений.
+    """
+    return ':'.join((
+        'blog', f'v{settings.BLOG_CACHE_VERSION}', family, *map(str, parts)
+    ))
+
+
+def get_feed_generation():
+    generation = cache.get(make_key('feed_generation'))
+    if generation is None:
+        generation = bump_feed_generation()
+    return generation
+
+
+def bump_feed_generation():
+    """Сделать недействительными все закэшированные страницы лент."""
+    generation = time.time_ns()
+    cache.set(make_key('feed_generation'), generation, None)
+    return generation
+
+
+def get_feed_timeout():
+    """Срок жизни страницы: не дольше, чем до ближайшей отложенной записи.
+
+    Запись, время которой уже пришло, но которую ещё не показал
+    планировщик, ограничивает срок одной секундой.
+    """
+    now = timezone.now()
+    next_pub_date = Post.objects.filter(
+        is_published=True, is_visible=False
+    ).order_by('pub_date').values_list('pub_date', flat=True).first()
+    timeout = settings.FEED_CACHE_TIMEOUT
+    if next_pub_date is not None:
+        timeout = min(
+            timeout, max(ceil((next_pub_date - now).total_seconds()), 1)
+        )
+    return timeout
+
+
+def get_requested_page(request):
+    """Запрошенная страница ленты как часть ключа кэша.
+
+    Номер страницы — целое число без лишних символов, курсор — разобранный
+    и указывающий на существующую публикацию. Для остальных значений
+    возвращается None, и такие страницы не кэшируются: иначе произвольные
+    ?page= и ?cursor= заполняли бы кэш новыми ключами и вытесняли бы
+    из него и страницы, и карточки публикаций.
+    """
+    if settings.PAGINATION_MODE == CURSOR_MODE:
+        cursor = request.GET.get('cursor')
+        if not cursor:
+            return 1
+        decoded = decode_cursor(cursor)
+        if decoded is None:
+            return None
+        direction, pub_date, pk = decoded
+        if not Post.objects.filter(pk=pk, pub_date=pub_date).exists():
+            return None
+        return f'{direction}{pk}'
+    page = request.GET.get('page')
+    if page is None:
+        return 1
+    if not page.isdigit() or page != str(int(page)) or int(page) < 1:
+        return None
+    return int(page)
+
+
+def get_feed_page_key(request, view_name, paginated=True, **kwargs):
+    """Ключ страницы ленты или None, если её не нужно кэшировать."""
+    page = get_requested_page(request) if paginated else 1
+    if page is None:
+        return None
+    return make_key(
+        'feed_page',
+        get_feed_generation(),
+        view_name,
+        *kwargs.values(),
+        page,
+    )
+
+
+def is_requested_page(request, key):
+    """Показана ли та страница, что запрошена: номер больше последнего
+    Paginator заменяет последней страницей, и её не нужно кэшировать
+    ещё под одним ключом (номер записывает paginate.get_paginator).
+    """
+    shown = getattr(request, 'feed_page_number', None)
+    return shown is None or key.endswith(f':{shown}')
+
+
+def cache_feed_page(view_func):
+    """Кэшировать готовую страницу ленты для анонимных пользователей."""
+    if iscoroutinefunction(view_func):
+        return _acache_feed_page(view_func)
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return view_func(request, *args, **kwargs)
+        key = get_feed_page_key(request, view_func.__name__, **kwargs)
+        if key is None:
+            return view_func(request, *args, **kwargs)
+        response = cache.get(key)
+        if response is not None:
+            return get_conditional_response(
+                request, etag=response.get('ETag'), response=response
+            )
+        response = view_func(request, *args, **kwargs)
+        if response.status_code == 200 and is_requested_page(request, key):
+            cache.set(key, response, get_feed_timeout())
+        return response
+    return wrapper
+
+
+def _acache_feed_page(view_func):
+    # request.user к этому моменту должен быть уже загружен (см.
+    # async_views.load_user): ленивая загрузка обращается к базе.
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return await view_func(request, *args, **kwargs)
+        key = await sync_to_async(get_feed_page_key)(
+            request, view_func.__name__, **kwargs
+        )
+        if key is None:
+            return await view_func(request, *args, **kwargs)
+        response = await cache.aget(key)
+        if response is not None:
+            return get_conditional_response(
+                request, etag=response.get('ETag'), response=response
+            )
+        response = await view_func(request, *args, **kwargs)
+        if response.status_code == 200 and is_requested_page(request, key):
+            timeout = await sync_to_async(get_feed_timeout)()
+            await cache.aset(key, response, timeout)
+        return response
+    return wrapper
@@ -0,0 +1,110 @@
+"""Валидаторы для условных GET-запросов (ETag) лент и страницы публикации.
+
+Для лент считаются одним-двумя лёгкими запросами по тем же фильтрам, что
+и сами страницы, чтобы при совпадении ETag ответить 304 без рендера.
+"""
+from functools import wraps
+from hashlib import md5
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .cache import get_feed_generation
+from .models import Category, Post
+from .paginate import CURSOR_MODE, get_cursor_page
+from .query_func import get_optimized_queryset
+
+
+def make_etag(request, *parts):
+    # Шапка страницы зависит от пользователя, а генерация ленты меняется
+    # при любом сохранении публикации, комментария или категории.
+    raw = repr((request.user.pk, get_feed_generation(), *parts))
+    return quote_etag(md5(raw.encode()).hexdigest())
+
+
+def get_page_rows(request, queryset, per_page=settings.NUM_OF_POSTS):
+    """Ключевые поля публикаций запрошенной страницы или None,
+    если страницу нельзя однозначно определить без пагинатора.
+    """
+    queryset = queryset.select_related(None).only(
+        'pub_date', 'updated_at', 'comment_count'
+    )
+    if settings.PAGINATION_MODE == CURSOR_MODE:
+        rows = list(get_cursor_page(
+            queryset, request.GET.get('cursor'), per_page
+        ))
+    else:
+        try:
+            page = max(int(request.GET.get('page') or 1), 1)
+        except ValueError:
+            return None
+        rows = list(queryset[(page - 1) * per_page:page * per_page])
+        if not rows and page > 1:
+            return None
+    return [
+        (post.pk, post.pub_date, post.updated_at, post.comment_count)
+        for post in rows
+    ]
+
+
+def index_etag(request):
+    rows = get_page_rows(request, get_optimized_queryset())
+    return None if rows is None else make_etag(request, rows)
+
+
+def category_etag(request, category_slug):
+    category = Category.objects.filter(
+        slug=category_slug, is_published=True
+    ).values_list('pk', 'updated_at').first()
+    if category is None:
+        return None
+    rows = get_page_rows(request, get_optimized_queryset(
+        manager=Post.objects.filter(category_id=category[0])
+    ))
+    return None if rows is None else make_etag(request, category, rows)
+
+
+def profile_etag(request, username):
+    profile = get_user_model().objects.filter(username=username).values_list(
+        'pk', 'first_name', 'last_name', 'is_staff'
+    ).first()
+    if profile is None:
+        return None
+    rows = get_page_rows(request, get_optimized_queryset(
+        manager=Post.objects.filter(author_id=profile[0]),
+        filters=request.user.pk != profile[0]
+    ))
+    return None if rows is None else make_etag(request, profile, rows)
+
+
+def post_etag(request, post):
+    """Метка ETag уже загруженной публикации без запроса к базе."""
+    return make_etag(
+        request, post.pk, post.updated_at, post.comment_count,
+        post.category and post.category.updated_at,
+        post.location and post.location.updated_at
+    )
+
+
+def async_condition(etag_func):
+    """Аналог django.views.decorators.http.condition для асинхронных
+    представлений (в Django 4.2 он их не поддерживает); etag_func
+    выполняется в потоке, так как обращается к базе синхронно.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await view_func(request, *args, **kwargs)
+            etag = await sync_to_async(etag_func)(request, *args, **kwargs)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await view_func(request, *args, **kwargs)
+                if etag and not response.has_header('ETag'):
+                    response['ETag'] = etag
+            return response
+        return wrapper
+    return decorator
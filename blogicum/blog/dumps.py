@@ -0,0 +1,91 @@
+"""Потоковое чтение дампов в формате dumpdata: JSON-массив или JSONL.
+
+Файл читается кусками по CHUNK_SIZE символов, объекты разбираются
+JSONDecoder.raw_decode по мере поступления, так что в памяти
+держится один кусок и один объект, а не весь дамп.
+"""
+import json
+
+CHUNK_SIZE = 1 << 20
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+class DumpError(ValueError):
+    pass
+
+
+def _skip(buffer, position, characters=_WHITESPACE):
+    while position < len(buffer) and buffer[position] in characters:
+        position += 1
+    return position
+
+
+def _read_array_start(stream, chunk_size):
+    """Прочитать поток до открывающей скобки; вернуть остаток куска."""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            raise DumpError('Дамп пуст.')
+        position = _skip(chunk, 0)
+        if position < len(chunk):
+            if chunk[position] != '[':
+                raise DumpError('Дамп должен быть JSON-массивом.')
+            return chunk[position + 1:]
+
+
+def _decode_objects(buffer):
+    """Разобрать из буфера все полные объекты.
+
+    Возвращает объекты, позицию после последнего из них и признак
+    закрывающей скобки массива.
+    """
+    objects, position = [], 0
+    while True:
+        position = _skip(buffer, position, _WHITESPACE + ',')
+        if position == len(buffer):
+            return objects, position, False
+        if buffer[position] == ']':
+            return objects, position, True
+        try:
+            obj, position = _decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            return objects, position, False
+        if not isinstance(obj, dict):
+            raise DumpError('Элементы дампа должны быть объектами.')
+        objects.append(obj)
+
+
+def iter_json_array(stream, chunk_size=CHUNK_SIZE):
+    """Объекты верхнего уровня из потока с JSON-массивом."""
+    buffer = _read_array_start(stream, chunk_size)
+    while True:
+        objects, position, finished = _decode_objects(buffer)
+        yield from objects
+        if finished:
+            return
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            raise DumpError('Дамп оборвался: объект или скобка не закрыты.')
+        buffer = buffer[position:] + chunk
+
+
+def iter_jsonl(stream):
+    """Объекты из потока JSONL: по одному JSON-объекту в строке."""
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise DumpError(f'Строка {number}: {error}') from error
+        if not isinstance(obj, dict):
+            raise DumpError(f'Строка {number}: ожидался объект.')
+        yield obj
+
+
+def iter_dump(stream, fmt):
+    if fmt == 'jsonl':
+        return iter_jsonl(stream)
+    return iter_json_array(stream)
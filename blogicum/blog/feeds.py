@@ -0,0 +1,138 @@
+"""RSS- и Atom-ленты публикаций: общая, по категории и по автору.
+
+Готовое тело ленты не зависит от пользователя, поэтому кэшируется для
+всех под тем же токеном поколения, что и HTML-страницы лент, и живёт
+не дольше, чем до ближайшей отложенной публикации.
+"""
+from hashlib import md5
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import quote_etag
+from django.utils.text import Truncator
+
+from .cache import get_feed_page_key, get_feed_timeout
+from .models import Category, Post
+from .query_func import get_optimized_queryset
+
+
+class CachedFeed(Feed):
+
+    def __call__(self, request, *args, **kwargs):
+        # Лента не разбита на страницы: ?page= и ?cursor= не входят в ключ.
+        key = get_feed_page_key(
+            request, type(self).__name__, paginated=False, **kwargs
+        )
+        response = cache.get(key)
+        if response is None:
+            response = super().__call__(request, *args, **kwargs)
+            response['ETag'] = quote_etag(md5(response.content).hexdigest())
+            cache.set(key, response, get_feed_timeout())
+        return get_conditional_response(
+            request, etag=response['ETag'], response=response
+        )
+
+
+class PostFeed(CachedFeed):
+    title = 'Блогикум'
+    description = 'Новые публикации Блогикума.'
+
+    def link(self, obj=None):
+        return reverse('blog:index')
+
+    def get_posts(self, obj):
+        return get_optimized_queryset(filters=True)
+
+    def items(self, obj=None):
+        return self.get_posts(obj)[:settings.FEED_ITEMS]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return Truncator(item.text).words(settings.FEED_DESCRIPTION_WORDS)
+
+    def item_link(self, item):
+        return reverse('blog:post_detail', args=[item.pk])
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+    def item_author_link(self, item):
+        return reverse('blog:profile', args=[item.author.username])
+
+    def item_categories(self, item):
+        return [item.category.title]
+
+
+class PostAtomFeed(PostFeed):
+    feed_type = Atom1Feed
+    subtitle = PostFeed.description
+
+
+class CategoryFeed(PostFeed):
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse('blog:category_posts', args=[obj.slug])
+
+    def get_posts(self, obj):
+        return get_optimized_queryset(
+            manager=Post.objects.filter(category=obj)
+        )
+
+
+class CategoryAtomFeed(CategoryFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return obj.description
+
+
+class AuthorFeed(PostFeed):
+
+    def get_object(self, request, username):
+        return get_object_or_404(get_user_model(), username=username)
+
+    def title(self, obj):
+        return f'Блогикум: @{obj.username}'
+
+    def description(self, obj):
+        return f'Публикации пользователя @{obj.username}.'
+
+    def link(self, obj):
+        return reverse('blog:profile', args=[obj.username])
+
+    def get_posts(self, obj):
+        return get_optimized_queryset(
+            manager=Post.objects.filter(author=obj)
+        )
+
+
+class AuthorAtomFeed(AuthorFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserChangeForm
 
 from .models import Post, Comment
+from .tasks import enqueue_image_job
 
 
 class PostForm(forms.ModelForm):
@@ -16,6 +17,15 @@ class PostForm(forms.ModelForm):
             )
         }
 
+    def save(self, commit=True):
+        image_changed = 'image' in self.changed_data
+        if image_changed:
+            self.instance.image_variants = []
+        post = super().save(commit)
+        if commit and image_changed and post.image:
+            enqueue_image_job(post)
+        return post
+
 
 class CommentForm(forms.ModelForm):
     class Meta:
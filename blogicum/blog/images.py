@@ -0,0 +1,72 @@
+import logging
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from .cache import bump_feed_generation
+
+logger = logging.getLogger(__name__)
+
+WEBP = 'webp'
+
+
+def get_variant_name(name, variant, extension=None):
+    """posts/photo.jpg -> posts/photo__card.jpg (или .webp)."""
+    path = PurePosixPath(name)
+    suffix = f'.{extension}' if extension else path.suffix
+    return str(path.with_name(f'{path.stem}__{variant}{suffix}'))
+
+
+def _save_variant(storage, name, image, image_format):
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, quality=85)
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def generate_image_variants(image_field):
+    """Сохранить рядом с оригиналом уменьшенные копии и их WebP-версии.
+
+    Возвращает имена построенных копий; пустой список, если картинку
+    не удалось прочитать.
+    """
+    storage = image_field.storage
+    try:
+        with storage.open(image_field.name) as source:
+            original = Image.open(source)
+            image_format = original.format
+            original = ImageOps.exif_transpose(original)
+            original.load()
+    except OSError:
+        logger.warning('Не удалось прочитать %s', image_field.name)
+        return []
+
+    for variant, width in settings.POST_IMAGE_VARIANTS.items():
+        resized = original.copy()
+        resized.thumbnail((width, width * 10))
+        if image_format == 'JPEG' and resized.mode not in ('RGB', 'L'):
+            resized = resized.convert('RGB')
+        _save_variant(
+            storage,
+            get_variant_name(image_field.name, variant),
+            resized, image_format
+        )
+        _save_variant(
+            storage,
+            get_variant_name(image_field.name, variant, WEBP),
+            resized, WEBP
+        )
+    return list(settings.POST_IMAGE_VARIANTS)
+
+
+def process_post_image(post):
+    """Построить копии картинки публикации и отметить их готовность."""
+    variants = generate_image_variants(post.image) if post.image else []
+    type(post).objects.filter(pk=post.pk).update(image_variants=variants)
+    post.image_variants = variants
+    bump_feed_generation()
+    return bool(variants)
@@ -0,0 +1,252 @@
+"""Дешёвые метрики запросов: число и время SQL, время рендера шаблонов,
+размер ответа. Пишутся в лог и в скользящую гистограмму в памяти.
+Бэкенды кэша отсюда считают попадания и промахи по семействам ключей.
+"""
+import json
+import logging
+import threading
+from asyncio import iscoroutinefunction
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.core.cache.backends import filebased, locmem, redis
+from django.db import connections
+from django.template.backends import django as django_backend
+
+logger = logging.getLogger('blog.metrics')
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('queries', 'sql_time', 'render_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.render_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_time += perf_counter() - started
+
+
+class RollingHistogram:
+    """Последние METRICS_WINDOW замеров по каждому представлению."""
+
+    FIELDS = ('duration', 'queries', 'sql_time', 'render_time', 'size')
+
+    def __init__(self, window):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+
+    def add(self, view_name, sample):
+        with self._lock:
+            self._samples[view_name].append(sample)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def snapshot(self):
+        with self._lock:
+            samples = {
+                view: list(rows) for view, rows in self._samples.items()
+            }
+        return {
+            view: {'count': len(rows), **{
+                field: _percentiles([row[field] for row in rows])
+                for field in self.FIELDS
+            }}
+            for view, rows in samples.items()
+        }
+
+
+def _percentiles(values):
+    values = sorted(value for value in values if value is not None)
+    if not values:
+        return None
+    last = len(values) - 1
+    return {
+        f'p{share}': values[round(share / 100 * last)]
+        for share in (50, 90, 99)
+    }
+
+
+histogram = RollingHistogram(settings.METRICS_WINDOW)
+
+
+class Template(django_backend.Template):
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(context, request)
+        started = perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.render_time += perf_counter() - started
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """Стандартный бэкенд шаблонов, засекающий время рендера."""
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return Template(template.template, self)
+
+
+class CacheStats:
+    """Попадания и промахи кэша по семействам ключей в этом процессе."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = defaultdict(lambda: [0, 0])
+
+    def record(self, key, hit):
+        with self._lock:
+            self._counts[get_key_family(key)][0 if hit else 1] += 1
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+    def snapshot(self):
+        with self._lock:
+            counts = {
+                family: tuple(row) for family, row in self._counts.items()
+            }
+        return {
+            family: {
+                'hits': hits,
+                'misses': misses,
+                'hit_ratio': round(hits / (hits + misses), 3),
+            }
+            for family, (hits, misses) in counts.items()
+        }
+
+
+def get_key_family(key):
+    """Семейство ключа: blog:v1:feed_page:... -> feed_page,
+    template.cache.post_card.<хеш> -> post_card.
+    """
+    if key.startswith('blog:'):
+        return key.split(':', 3)[2]
+    if key.startswith('template.cache.'):
+        return key.split('.')[2]
+    return 'other'
+
+
+cache_stats = CacheStats()
+
+_MISSING = object()
+
+
+class CountingCacheMixin:
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        hit = value is not _MISSING
+        cache_stats.record(key, hit)
+        return value if hit else default
+
+
+class LocMemCache(CountingCacheMixin, locmem.LocMemCache):
+    pass
+
+
+class FileBasedCache(CountingCacheMixin, filebased.FileBasedCache):
+    pass
+
+
+class RedisCache(CountingCacheMixin, redis.RedisCache):
+    # Здесь get_many не сводится к get, как в остальных бэкендах.
+    def get_many(self, keys, version=None):
+        values = super().get_many(keys, version)
+        for key in keys:
+            cache_stats.record(key, key in values)
+        return values
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = perf_counter()
+        try:
+            with self.wrap_connections(metrics):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, metrics, perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        # Запросы асинхронного ORM выполняются в потоке sync_to_async,
+        # но в том же контексте, поэтому видят те же обёртки и метрики.
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = perf_counter()
+        try:
+            with self.wrap_connections(metrics):
+                response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.record(request, response, metrics, perf_counter() - started)
+        return response
+
+    @staticmethod
+    def wrap_connections(metrics):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics))
+        return stack
+
+    def record(self, request, response, metrics, duration):
+        match = request.resolver_match
+        view_name = match.view_name if match else None
+        sample = {
+            'duration': duration,
+            'queries': metrics.queries,
+            'sql_time': metrics.sql_time,
+            'render_time': metrics.render_time,
+            'size': None if response.streaming else len(response.content),
+        }
+        histogram.add(view_name, sample)
+        # По умолчанию blog.metrics пишет только WARNING: не собирать JSON
+        # на каждый запрос, чтобы тут же его выбросить.
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({
+                'view': view_name,
+                'method': request.method,
+                'status': response.status_code,
+                **sample,
+            }))
+
+        budget = settings.VIEW_QUERY_BUDGETS.get(view_name)
+        if budget is not None and metrics.queries > budget:
+            logger.warning(
+                'Превышен бюджет запросов для %s: %d из %d',
+                view_name, metrics.queries, budget
+            )
@@ -0,0 +1,108 @@
+"""Справочники категорий и местоположений в памяти процесса.
+
+Категорий и местоположений единицы, а нужны они в каждой карточке
+публикации. Вместо выборки их столбцов в каждом запросе лент таблицы
+целиком загружаются в память, а PostQuerySet.with_lookups() подставляет
+объекты в загруженные публикации по category_id и location_id.
+
+Справочники служат только для отображения: видимость публикаций
+по-прежнему проверяется в SQL (category__is_published). Сигналы
+сохранения и удаления категорий и местоположений меняют поколение
+справочников в общем кэше (make_key), и каждый процесс перечитывает их
+при следующем обращении. Если кэш у процессов свой (locmem), чужие
+изменения видны не позже чем через LOOKUP_CACHE_TIMEOUT секунд.
+"""
+import time
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.query import ModelIterable
+
+from .cache import make_key
+from .models import Category, Location, Post
+
+CATEGORY_FIELD = Post._meta.get_field('category')
+LOCATION_FIELD = Post._meta.get_field('location')
+
+
+class LookupTables(NamedTuple):
+    loaded_at: float
+    generation: object
+    categories: dict
+    locations: dict
+
+
+_tables = None
+
+
+def clear_lookups():
+    """Забыть справочники текущего процесса."""
+    global _tables
+    _tables = None
+
+
+def bump_lookup_generation():
+    """Заставить все процессы перечитать справочники."""
+    cache.set(make_key('lookup_generation'), time.time_ns(), None)
+    clear_lookups()
+
+
+def get_lookup_tables():
+    global _tables
+    tables = _tables
+    generation = cache.get(make_key('lookup_generation'))
+    if (
+        tables is None
+        or tables.generation != generation
+        or time.monotonic() - tables.loaded_at > settings.LOOKUP_CACHE_TIMEOUT
+    ):
+        tables = _tables = LookupTables(
+            loaded_at=time.monotonic(),
+            generation=generation,
+            categories={
+                category.pk: category for category in Category.objects.all()
+            },
+            locations={
+                location.pk: location for location in Location.objects.all()
+            },
+        )
+    return tables
+
+
+def attach_lookups(posts, tables=None):
+    """Подставить категории и местоположения публикаций из справочников.
+
+    Связи, которых в справочнике нет (объект создан в другом процессе
+    после загрузки), остаются ленивыми и загрузятся обычным запросом.
+    """
+    tables = tables or get_lookup_tables()
+    for post in posts:
+        for field, table in (
+            (CATEGORY_FIELD, tables.categories),
+            (LOCATION_FIELD, tables.locations),
+        ):
+            related_id = getattr(post, field.attname)
+            if related_id is None:
+                field.set_cached_value(post, None)
+            elif related_id in table:
+                field.set_cached_value(post, table[related_id])
+
+
+class LookupIterable(ModelIterable):
+    """ModelIterable, подставляющий справочники в каждую публикацию.
+
+    Справочники загружаются при первой публикации, у которой есть
+    category_id и location_id: запросы с .only() без них (например,
+    для ETag лент) обходятся без справочников и без догрузки полей.
+    """
+
+    def __iter__(self):
+        tables = None
+        for post in super().__iter__():
+            if not {
+                CATEGORY_FIELD.attname, LOCATION_FIELD.attname
+            } & post.get_deferred_fields():
+                tables = tables or get_lookup_tables()
+                attach_lookups([post], tables)
+            yield post
@@ -0,0 +1,255 @@
+import time
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers import base, python
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from blog.cache import bump_feed_generation
+from blog.dumps import DumpError, iter_dump
+from blog.lookups import bump_lookup_generation
+from blog.scheduler import hide_unpublished_posts, publish_due_posts
+from blog.sitemaps import SECTIONS, invalidate
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает дамп dumpdata (JSON или JSONL) пачками через '
+        'bulk_create, без save() и сигналов для каждого объекта.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('dump', help='Путь к .json или .jsonl.')
+        parser.add_argument(
+            '--format', choices=('json', 'jsonl'),
+            help='Формат дампа; по умолчанию — по расширению файла.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Количество объектов, вставляемых за одну транзакцию.'
+        )
+        parser.add_argument(
+            '-e', '--exclude', action='append', default=[],
+            help='Пропустить приложение или модель (app или app.model).'
+        )
+        parser.add_argument(
+            '--keep-indexes', action='store_true',
+            help='Не удалять индексы из Meta.indexes на время загрузки.'
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        path = Path(options['dump'])
+        if not path.exists():
+            raise CommandError(f'Файл {path} не найден.')
+        fmt = options['format'] or (
+            'jsonl' if path.suffix == '.jsonl' else 'json'
+        )
+        self.using = options['database']
+        self.connection = connections[self.using]
+        self.batch_size = options['batch_size']
+        self.excluded = {label.lower() for label in options['exclude']}
+        self.buffers = defaultdict(list)
+        self.natural_keys = {}
+        self.counts = Counter()
+
+        deferred = [] if options['keep_indexes'] else self.drop_indexes()
+        started = time.perf_counter()
+        try:
+            with path.open(encoding='utf-8') as stream:
+                self.load(iter_dump(stream, fmt))
+        except (DumpError, base.DeserializationError) as error:
+            raise CommandError(f'{path}: {error}') from error
+        finally:
+            self.create_indexes(deferred)
+        elapsed = time.perf_counter() - started
+
+        self.reset_sequences()
+        if any(model._meta.app_label == 'blog' for model in self.counts):
+            self.post_process()
+
+        total = sum(self.counts.values())
+        for model, count in self.counts.items():
+            self.stdout.write(f'{model._meta.label}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено объектов: {total} за {elapsed:.1f} с '
+            f'({total / elapsed if elapsed else total:.0f} в секунду)'
+        ))
+
+    def load(self, objects):
+        # SQLite умеет отключать проверку внешних ключей, и тогда каждую
+        # пачку можно фиксировать отдельно, а ссылки проверить в конце.
+        # В PostgreSQL ограничения отложены до фиксации транзакции,
+        # поэтому ссылки вперёд по дампу возможны только в одной общей.
+        checks_disabled = self.connection.disable_constraint_checking()
+        try:
+            outer = (
+                nullcontext() if checks_disabled
+                else transaction.atomic(using=self.using)
+            )
+            with outer:
+                deserialized = python.Deserializer(
+                    self.resolve(objects), using=self.using,
+                    ignorenonexistent=True
+                )
+                buffered = 0
+                for obj in deserialized:
+                    self.buffer(obj)
+                    buffered += 1
+                    if buffered >= self.batch_size:
+                        self.flush()
+                        buffered = 0
+                self.flush()
+        finally:
+            if checks_disabled:
+                self.connection.enable_constraint_checking()
+        if checks_disabled:
+            self.connection.check_constraints(table_names=[
+                model._meta.db_table for model in self.counts
+            ])
+
+    def resolve(self, objects):
+        """Пропустить исключённые модели и заменить натуральные ключи.
+
+        Натуральные ключи внешних ключей заменяются на pk; найденные
+        значения запоминаются.
+        """
+        for obj in objects:
+            label = obj.get('model', '').lower()
+            if label in self.excluded or label.split('.')[0] in self.excluded:
+                continue
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as error:
+                raise CommandError(f'Неизвестная модель {label!r}.') from error
+            fields = obj.get('fields', {})
+            for field in model._meta.concrete_fields:
+                value = fields.get(field.name)
+                if field.is_relation and isinstance(value, list):
+                    fields[field.name] = self.get_pk(
+                        field.related_model, tuple(value)
+                    )
+            yield obj
+
+    def get_pk(self, model, natural_key):
+        key = (model, natural_key)
+        if key not in self.natural_keys:
+            self.natural_keys[key] = self.find_pk(model, natural_key)
+        return self.natural_keys[key]
+
+    def find_pk(self, model, natural_key):
+        manager = model._default_manager.db_manager(self.using)
+        if not hasattr(manager, 'get_by_natural_key'):
+            raise CommandError(
+                f'У {model._meta.label} нет натурального ключа.'
+            )
+        try:
+            return manager.get_by_natural_key(*natural_key).pk
+        except model.DoesNotExist:
+            pass
+        # Объект мог встретиться в дампе, но ещё не попасть в базу.
+        for obj, _ in self.buffers.get(model, ()):
+            if tuple(obj.natural_key()) == natural_key:
+                return obj.pk
+        raise CommandError(
+            f'Не удалось найти {model._meta.label} по ключу '
+            f'{list(natural_key)}: объект должен быть в базе или раньше '
+            'в дампе.'
+        )
+
+    def buffer(self, deserialized):
+        self.buffers[type(deserialized.object)].append(
+            (deserialized.object, deserialized.m2m_data or {})
+        )
+
+    def flush(self):
+        with transaction.atomic(using=self.using):
+            for model, items in self.buffers.items():
+                self.insert(model, [obj for obj, _ in items])
+                self.insert_m2m(model, items)
+                self.counts[model] += len(items)
+        self.buffers.clear()
+
+    def insert(self, model, objects):
+        manager = model._base_manager.db_manager(self.using)
+        with_pk = [obj for obj in objects if obj.pk is not None]
+        without_pk = [obj for obj in objects if obj.pk is None]
+        pk = model._meta.pk
+        update_fields = [
+            field.name for field in model._meta.concrete_fields
+            if field is not pk
+        ]
+        if with_pk and update_fields:
+            # Как и loaddata, объект с уже существующим pk перезаписывается.
+            manager.bulk_create(
+                with_pk, update_conflicts=True, unique_fields=[pk.name],
+                update_fields=update_fields
+            )
+        elif with_pk:
+            manager.bulk_create(with_pk, ignore_conflicts=True)
+        if without_pk:
+            manager.bulk_create(without_pk)
+
+    def insert_m2m(self, model, items):
+        for field in model._meta.many_to_many:
+            through = field.remote_field.through
+            source = f'{field.m2m_field_name()}_id'
+            target = f'{field.m2m_reverse_field_name()}_id'
+            rows = [
+                through(**{source: obj.pk, target: value})
+                for obj, m2m_data in items
+                for value in m2m_data.get(field.name, ())
+            ]
+            if rows:
+                through._default_manager.db_manager(self.using).bulk_create(
+                    rows, ignore_conflicts=True
+                )
+
+    def drop_indexes(self):
+        """Удалить индексы Meta.indexes на время загрузки.
+
+        Построить индекс один раз после загрузки дешевле, чем обновлять
+        его при каждой вставке.
+        """
+        deferred = [
+            (model, index)
+            for model in apps.get_models()
+            if model._meta.managed
+            for index in model._meta.indexes
+        ]
+        with self.connection.schema_editor() as editor:
+            for model, index in deferred:
+                editor.remove_index(model, index)
+        return deferred
+
+    def create_indexes(self, deferred):
+        if not deferred:
+            return
+        with self.connection.schema_editor() as editor:
+            for model, index in deferred:
+                editor.add_index(model, index)
+
+    def reset_sequences(self):
+        statements = self.connection.ops.sequence_reset_sql(
+            no_style(), list(self.counts)
+        )
+        if statements:
+            with self.connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def post_process(self):
+        """Восстановить то, что обычно поддерживают save() и сигналы."""
+        call_command('recount_comments', stdout=self.stdout)
+        call_command('rebuild_search_index', stdout=self.stdout)
+        bump_lookup_generation()
+        publish_due_posts()
+        hide_unpublished_posts()
+        bump_feed_generation()
+        for section in SECTIONS:
+            invalidate(section)
@@ -0,0 +1,72 @@
+from functools import partial
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.exports import (
+    CSV, FORMATS, JSONL, RESOURCES, ExportError, iter_export, parse_after,
+    parse_since
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает публикации или комментарии в JSONL или CSV порциями, '
+        'не загружая все записи в память.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', choices=tuple(RESOURCES))
+        parser.add_argument(
+            '--format', choices=tuple(FORMATS), default=JSONL,
+            help='Формат выгрузки.'
+        )
+        parser.add_argument(
+            '--since',
+            help=(
+                'Выгрузить только записи, изменённые не раньше этого '
+                'момента (ISO 8601).'
+            )
+        )
+        parser.add_argument(
+            '--after-id',
+            help=(
+                'Вместе с --since: id последней записи предыдущей выгрузки; '
+                'записи с тем же updated_at и меньшим id пропускаются.'
+            )
+        )
+        parser.add_argument(
+            '-o', '--output',
+            help='Файл для выгрузки; по умолчанию — стандартный вывод.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=settings.EXPORT_CHUNK_SIZE,
+            help='Количество записей, читаемых из базы за один запрос.'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            lines = iter_export(
+                options['resource'], options['format'],
+                parse_since(options['since']), options['chunk_size'],
+                parse_after(options['after_id'])
+            )
+        except ExportError as error:
+            raise CommandError(error) from error
+        if options['output']:
+            with open(
+                options['output'], 'w', encoding='utf-8', newline=''
+            ) as output:
+                written = self.write(lines, output.write)
+        else:
+            written = self.write(lines, partial(self.stdout.write, ending=''))
+        if options['format'] == CSV:
+            written -= 1
+        self.stderr.write(f'Выгружено записей: {written}')
+
+    def write(self, lines, write):
+        written = 0
+        for line in lines:
+            write(line)
+            written += 1
+        return written
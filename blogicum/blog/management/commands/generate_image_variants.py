@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.cache import bump_feed_generation
+from blog.images import generate_image_variants
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Строит уменьшенные копии фото для уже загруженных публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help='Количество потоков обработки картинок.'
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Перестроить копии и для публикаций, где они уже готовы.'
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').only('pk', 'image')
+        if not options['all']:
+            posts = posts.filter(image_variants=[])
+
+        ready, failed = [], 0
+        # В потоках — только работа с файлами, база обновляется здесь.
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            results = executor.map(
+                lambda post: (post.pk, generate_image_variants(post.image)),
+                posts.iterator(chunk_size=500)
+            )
+            for pk, variants in results:
+                if variants:
+                    ready.append(pk)
+                else:
+                    failed += 1
+
+        for start in range(0, len(ready), 500):
+            Post.objects.filter(pk__in=ready[start:start + 500]).update(
+                image_variants=list(settings.POST_IMAGE_VARIANTS)
+            )
+        if ready:
+            bump_feed_generation()
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано: {len(ready)}, с ошибками: {failed}'
+        ))
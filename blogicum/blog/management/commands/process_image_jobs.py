@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.tasks import run_pending_image_jobs
+
+
+class Command(BaseCommand):
+    help = 'Выполняет задачи обработки фото, оставшиеся в очереди.'
+
+    def handle(self, *args, **options):
+        processed = run_pending_image_jobs()
+        self.stdout.write(self.style.SUCCESS(f'Обработано задач: {processed}'))
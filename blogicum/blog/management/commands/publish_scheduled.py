@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.scheduler import hide_unpublished_posts, publish_due_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает в лентах отложенные публикации, время которых пришло, '
+        'и скрывает снятые с публикации в обход save().'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Запускаться повторно каждые N секунд (0 — один раз).'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            changed = publish_due_posts() + hide_unpublished_posts()
+            self.stdout.write(f'Изменена видимость публикаций: {changed}')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
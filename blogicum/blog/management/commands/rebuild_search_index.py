@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Post
+from blog.search import get_backend
+
+
+class Command(BaseCommand):
+    help = (
+        'Заново строит поисковый индекс публикаций, например после '
+        'загрузки данных в обход сигналов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество публикаций, индексируемых за одну транзакцию.'
+        )
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        batch_size = options['batch_size']
+        last_pk, indexed = 0, 0
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_pk).order_by('pk')
+                .only('title', 'text')[:batch_size]
+            )
+            if not batch:
+                break
+            with transaction.atomic():
+                for post in batch:
+                    backend.index(post)
+            indexed += len(batch)
+            last_pk = batch[-1].pk
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано публикаций: {indexed}')
+        )
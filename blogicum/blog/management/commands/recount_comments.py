@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённые счётчики комментариев публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество публикаций, пересчитываемых за одну транзакцию.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        actual_count = Coalesce(Subquery(
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by().values('post')
+            .annotate(total=Count('pk')).values('total')
+        ), 0)
+        last_pk, repaired = 0, 0
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_pk)
+                .order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            with transaction.atomic():
+                repaired += (
+                    Post.objects.filter(pk__in=batch)
+                    .exclude(comment_count=actual_count)
+                    .update(
+                        comment_count=actual_count, updated_at=timezone.now()
+                    )
+                )
+            last_pk = batch[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {repaired}')
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.21 on 2026-10-18 05:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_variants',
+            field=models.JSONField(default=list, editable=False, verbose_name='Готовые уменьшенные копии фото'),
+        ),
+    ]
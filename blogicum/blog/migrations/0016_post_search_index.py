@@ -0,0 +1,69 @@
+import re
+
+import snowballstemmer
+from django.db import migrations
+
+# Копия констант и стемминга из blog.search на момент миграции: миграции
+# не должны зависеть от кода приложения, который может измениться.
+FTS_TABLE = 'blog_post_fts'
+PG_SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(text, '')), 'B')"
+)
+WORD_RE = re.compile(r'\w+')
+CYRILLIC_RE = re.compile('[а-яё]')
+
+
+def stem_text(text):
+    stemmers = {
+        'russian': snowballstemmer.stemmer('russian'),
+        'english': snowballstemmer.stemmer('english'),
+    }
+    words = []
+    for word in WORD_RE.findall(text or ''):
+        word = word.lower().replace('ё', 'е')
+        language = 'russian' if CYRILLIC_RE.search(word) else 'english'
+        words.append(stemmers[language].stemWord(word))
+    return ' '.join(words)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS blog_post_search_idx '
+            f'ON blog_post USING GIN (({PG_SEARCH_VECTOR}))'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} '
+            "USING fts5(title, text, tokenize='unicode61')"
+        )
+        Post = apps.get_model('blog', 'Post')
+        for pk, title, text in Post.objects.values_list(
+            'pk', 'title', 'text'
+        ).iterator():
+            schema_editor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                'VALUES (%s, %s, %s)',
+                [pk, stem_text(title), stem_text(text)]
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS blog_post_search_idx')
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
 
 
 User = get_user_model()
@@ -7,6 +9,18 @@ MAX_LENGTH_OF_TITLES = 256
 LIMIT_STR_SYMB = 30
 
 
+class ModificationDateTimeField(models.DateTimeField):
+    """Время последнего изменения записи.
+
+    Отдельный класс нужен только затем, чтобы тип поля отличался от
+    created_at; в миграциях поле записывается как обычный DateTimeField.
+    """
+
+    def deconstruct(self):
+        name, _, args, kwargs = super().deconstruct()
+        return name, 'django.db.models.DateTimeField', args, kwargs
+
+
 class PublishedMode(models.Model):
     is_published = models.BooleanField(
         default=True,
@@ -16,6 +30,9 @@ class PublishedMode(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True, verbose_name='Добавлено'
     )
+    updated_at = ModificationDateTimeField(
+        auto_now=True, db_index=True, verbose_name='Изменено'
+    )
 
     class Meta:
         abstract = True
@@ -55,6 +72,18 @@ class Category(PublishedMode):
         return self.title[:LIMIT_STR_SYMB]
 
 
+class PostQuerySet(models.QuerySet):
+
+    def with_lookups(self):
+        """Брать категорию и местоположение из справочников в памяти
+        (blog/lookups.py), а не из столбцов JOIN.
+        """
+        from .lookups import LookupIterable
+        clone = self._chain()
+        clone._iterable_class = LookupIterable
+        return clone
+
+
 class Post(PublishedMode):
     title = models.CharField(
         max_length=MAX_LENGTH_OF_TITLES, verbose_name='Заголовок'
@@ -69,6 +98,7 @@ class Post(PublishedMode):
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name='Автор публикации'
     )
     location = models.ForeignKey(
@@ -81,24 +111,107 @@ class Post(PublishedMode):
         Category,
         on_delete=models.SET_NULL,
         null=True,
+        db_index=False,
         verbose_name='Категория'
     )
     image = models.ImageField('Фото', blank=True)
+    image_variants = models.JSONField(
+        default=list, editable=False,
+        verbose_name='Готовые уменьшенные копии фото'
+    )
+    is_visible = models.BooleanField(
+        default=False, editable=False,
+        verbose_name='Видна в лентах',
+        help_text=(
+            'Опубликована и дата публикации наступила; поддерживается '
+            'планировщиком публикаций.')
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Количество комментариев'
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         default_related_name = 'posts'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('is_visible', '-pub_date'),
+                name='post_published_feed_idx'
+            ),
+            models.Index(
+                fields=('category', 'is_visible', '-pub_date'),
+                name='post_category_feed_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_feed_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title[:LIMIT_STR_SYMB]
 
+    def save(self, *args, **kwargs):
+        self.is_visible = self.is_published and self.pub_date <= timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'is_visible'}
+        super().save(*args, **kwargs)
+
+    def get_image_variant_url(self, variant, extension=None):
+        from .images import get_variant_name
+        return self.image.storage.url(
+            get_variant_name(self.image.name, variant, extension)
+        )
+
+    def _get_image_srcset(self, extension=None):
+        return ', '.join(
+            f'{self.get_image_variant_url(variant, extension)} {width}w'
+            for variant, width in settings.POST_IMAGE_VARIANTS.items()
+            if variant in self.image_variants
+        )
+
+    @property
+    def card_version(self):
+        """Версия карточки публикации (includes/post_card.html): меняется
+        вместе со всем, что в ней показано.
+        """
+        category, location = self.category, self.location
+        return '|'.join(str(value) for value in (
+            self.updated_at,
+            self.comment_count,
+            ','.join(self.image_variants),
+            self.author.username,
+            category and category.updated_at,
+            location and location.updated_at,
+        ))
+
+    @property
+    def image_card_url(self):
+        return self.get_image_variant_url('card')
+
+    @property
+    def image_detail_url(self):
+        return self.get_image_variant_url('detail')
+
+    @property
+    def image_srcset(self):
+        return self._get_image_srcset()
+
+    @property
+    def image_webp_srcset(self):
+        return self._get_image_srcset('webp')
+
 
 class Comment(PublishedMode):
     post = models.ForeignKey(
         Post,
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name='Публикация',
         related_name='comments'
     )
@@ -118,6 +231,55 @@ class Comment(PublishedMode):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx'
+            ),
+        )
 
     def __str__(self):
         return self.text[:LIMIT_STR_SYMB]
+
+
+class ImageJob(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Готово'),
+        (FAILED, 'Ошибка'),
+    )
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name='Публикация',
+        related_name='image_jobs'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        db_index=True,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Добавлено'
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Изменено')
+
+    class Meta:
+        ordering = ('created_at',)
+        verbose_name = 'обработка фото'
+        verbose_name_plural = 'Обработка фото'
+
+    def __str__(self):
+        return f'{self.post_id}: {self.get_status_display()}'
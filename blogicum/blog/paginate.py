@@ -1,9 +1,143 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as DecodeError
+from datetime import datetime
+
 from django.core.paginator import Paginator
 from django.conf import settings
+from django.db.models import Q
+
+PAGE_MODE = 'pages'
+CURSOR_MODE = 'cursor'
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class CursorPage:
+    """Страница ленты, выбранная по ключу (pub_date, id) без OFFSET."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def encode_cursor(direction, post):
+    raw = f'{direction}|{post.pub_date.isoformat()}|{post.pk}'
+    return urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
 
+def decode_cursor(cursor):
+    """Вернуть (направление, pub_date, id) или None для битого курсора."""
+    if not cursor:
+        return None
+    try:
+        raw = urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        direction, pub_date, pk = raw.split('|')
+        if direction not in (NEXT, PREVIOUS):
+            return None
+        return direction, datetime.fromisoformat(pub_date), int(pk)
+    except (DecodeError, UnicodeDecodeError, ValueError):
+        return None
 
-def get_paginator(request, queryset, per_page=settings.NUM_OF_POSTS):
+
+def get_cursor_queryset(queryset, cursor, per_page=settings.NUM_OF_POSTS):
+    """Запрос строк страницы (на одну больше) и разобранный курсор."""
+    decoded = decode_cursor(cursor)
+    if decoded is None:
+        queryset = queryset.order_by('-pub_date', '-pk')
+    elif decoded[0] == NEXT:
+        _, pub_date, pk = decoded
+        queryset = queryset.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+        ).order_by('-pub_date', '-pk')
+    else:
+        _, pub_date, pk = decoded
+        queryset = queryset.filter(
+            Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+        ).order_by('pub_date', 'pk')
+    return queryset[:per_page + 1], decoded
+
+
+def build_cursor_page(rows, decoded, per_page=settings.NUM_OF_POSTS):
+    if decoded is None:
+        has_next, has_previous = len(rows) > per_page, False
+        rows = rows[:per_page]
+    elif decoded[0] == NEXT:
+        has_next, has_previous = len(rows) > per_page, True
+        rows = rows[:per_page]
+    else:
+        has_next, has_previous = True, len(rows) > per_page
+        rows = rows[:per_page][::-1]
+
+    return CursorPage(
+        rows,
+        next_cursor=(
+            encode_cursor(NEXT, rows[-1]) if has_next and rows else None
+        ),
+        previous_cursor=(
+            encode_cursor(PREVIOUS, rows[0]) if has_previous and rows
+            else None
+        ),
+    )
+
+
+def get_cursor_page(queryset, cursor, per_page=settings.NUM_OF_POSTS):
+    queryset, decoded = get_cursor_queryset(queryset, cursor, per_page)
+    return build_cursor_page(list(queryset), decoded, per_page)
+
+
+async def aget_cursor_page(queryset, cursor, per_page=settings.NUM_OF_POSTS):
+    queryset, decoded = get_cursor_queryset(queryset, cursor, per_page)
+    rows = [row async for row in queryset]
+    return build_cursor_page(rows, decoded, per_page)
+
+
+def get_paginator(
+        request, queryset, per_page=settings.NUM_OF_POSTS, mode=None):
+    if (mode or settings.PAGINATION_MODE) == CURSOR_MODE:
+        page_obj = get_cursor_page(
+            queryset, request.GET.get('cursor'), per_page
+        )
+        return {'page_obj': page_obj}
     paginator = Paginator(queryset, per_page)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    # По нему cache_feed_page не кэширует номера больше последнего.
+    request.feed_page_number = page_obj.number
+    return {'page_obj': page_obj}
+
+
+async def aget_paginator(
+        request, queryset, per_page=settings.NUM_OF_POSTS, mode=None):
+    """То же, что get_paginator, но страница читается асинхронным ORM."""
+    if (mode or settings.PAGINATION_MODE) == CURSOR_MODE:
+        page_obj = await aget_cursor_page(
+            queryset, request.GET.get('cursor'), per_page
+        )
+        return {'page_obj': page_obj}
+    paginator = Paginator(queryset, per_page)
+    paginator.count = await queryset.acount()
+    page_obj = paginator.get_page(request.GET.get('page'))
+    request.feed_page_number = page_obj.number
+    page_obj.object_list = [post async for post in page_obj.object_list]
     return {'page_obj': page_obj}
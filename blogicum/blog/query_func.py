@@ -1,22 +1,126 @@
-from django.db import models
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import Q
 from django.utils import timezone
 
 from .models import Post
+from .scheduler import ensure_publication_lag
 
 
-def get_optimized_queryset(
-        manager=Post.objects, filters=True, annotations=False):
-    queryset = manager.select_related('category', 'author', 'location')
+def get_optimized_queryset(manager=Post.objects, filters=True):
+    # Категории и местоположения для карточек подставляются из
+    # справочников в памяти; опубликованность категории проверяется
+    # в самом запросе, а не по справочнику.
+    queryset = manager.select_related('author').with_lookups()
 
     if filters:
+        ensure_publication_lag()
         queryset = queryset.filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=timezone.now()
+            is_visible=True,
+            category__is_published=True
         )
-    if annotations:
-        queryset = queryset.annotate(
-            comment_count=models.Count('comments')
-        ).order_by('-pub_date')
 
     return queryset
+
+
+async def aget_optimized_queryset(manager=Post.objects, filters=True):
+    """Вариант для асинхронных представлений: планировщик, который может
+    писать в базу, запускается в потоке, а сам запрос остаётся ленивым.
+    """
+    if filters:
+        await sync_to_async(ensure_publication_lag)()
+    return get_optimized_queryset(manager=manager, filters=filters)
+
+
+def get_detail_queryset(manager=Post.objects):
+    """Запрос одной публикации: категория и местоположение — через JOIN.
+
+    Для одной записи это дешевле загрузки справочников в холодном
+    процессе, а is_post_visible проверяет свежую категорию.
+    """
+    return manager.select_related('category', 'author', 'location')
+
+
+def is_post_visible(post):
+    """Видимость уже загруженной записи; в отличие от фильтра лент
+    не зависит от того, когда в последний раз запускался планировщик.
+    """
+    return (
+        post.is_published
+        and post.category is not None
+        and post.category.is_published
+        and post.pub_date <= timezone.now()
+    )
+
+
+def get_changed_since(manager, since=None, after_pk=None):
+    """Записи после курсора (since, after_pk) по возрастанию (updated_at, pk).
+
+    Массовый update() ставит многим записям одно и то же updated_at,
+    поэтому одного времени для продолжения мало: потребитель запоминает
+    updated_at и pk последней обработанной записи и передаёт их сюда.
+    Без after_pk возвращаются все записи, изменённые не раньше since.
+    """
+    queryset = manager.order_by('updated_at', 'pk')
+    if since is not None and after_pk is None:
+        queryset = queryset.filter(updated_at__gte=since)
+    elif since is not None:
+        queryset = queryset.filter(
+            Q(updated_at__gt=since) | Q(updated_at=since, pk__gt=after_pk)
+        )
+    return queryset
+
+
+def iterate_by_pk(queryset, chunk_size=2000):
+    """Обойти queryset по возрастанию pk порциями без OFFSET.
+
+    В PostgreSQL это один запрос с серверным курсором, из которого
+    .iterator() читает по chunk_size строк. В остальных базах каждая
+    порция — отдельный запрос WHERE pk > последний pk. В обоих случаях
+    в памяти не больше chunk_size записей. Для values_list первым полем
+    должен быть pk.
+    """
+    queryset = queryset.order_by('pk')
+    connection = connections[queryset.db]
+    if (
+        connection.vendor == 'postgresql'
+        and not connection.settings_dict['DISABLE_SERVER_SIDE_CURSORS']
+    ):
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+    chunk = list(queryset[:chunk_size])
+    while chunk:
+        yield from chunk
+        last = chunk[-1]
+        last_pk = last[0] if isinstance(last, tuple) else last.pk
+        chunk = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+
+
+def iterate_changed_since(manager, fields, since=None, after_pk=None,
+                          chunk_size=2000):
+    """Обойти values_list(*fields) из get_changed_since порциями.
+
+    Порции берутся по курсору (updated_at, pk), а не по pk, чтобы порядок
+    выгрузки совпадал с курсором следующей инкрементальной выгрузки.
+    Первым полем должен быть pk; среди полей должно быть updated_at.
+    В PostgreSQL это один запрос с серверным курсором, как и в
+    iterate_by_pk.
+    """
+    queryset = get_changed_since(manager, since, after_pk).values_list(
+        *fields
+    )
+    connection = connections[queryset.db]
+    if (
+        connection.vendor == 'postgresql'
+        and not connection.settings_dict['DISABLE_SERVER_SIDE_CURSORS']
+    ):
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+    position = fields.index('updated_at')
+    chunk = list(queryset[:chunk_size])
+    while chunk:
+        yield from chunk
+        last = chunk[-1]
+        chunk = list(get_changed_since(
+            manager, last[position], last[0]
+        ).values_list(*fields)[:chunk_size])
@@ -0,0 +1,76 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import bump_feed_generation
+from .models import Post
+
+_lock = threading.Lock()
+_last_run = float('-inf')
+
+
+def _invalidate_changed(now):
+    # sitemaps -> query_func -> scheduler: импорт на месте.
+    from .sitemaps import invalidate_posts
+    bump_feed_generation()
+    invalidate_posts(Post.objects.filter(updated_at=now).values_list(
+        'pk', 'author_id'
+    ))
+
+
+def publish_due_posts(now=None):
+    """Показать в лентах отложенные публикации, время которых пришло.
+
+    Вызывается и из запросов лент, поэтому здесь только запрос по индексу
+    post_published_feed_idx, а UPDATE (и блокировка записи в SQLite)
+    выполняется, лишь когда показывать действительно есть что.
+    Возвращает количество показанных публикаций.
+    """
+    now = now or timezone.now()
+    due = Post.objects.filter(
+        is_visible=False, is_published=True, pub_date__lte=now
+    )
+    if not due.exists():
+        return 0
+    shown = due.update(is_visible=True, updated_at=now)
+    if shown:
+        _invalidate_changed(now)
+    return shown
+
+
+def hide_unpublished_posts(now=None):
+    """Скрыть видимые публикации, снятые с публикации или перенесённые
+    в будущее в обход save().
+
+    save() сам поддерживает is_visible, так что расходиться флаг может
+    только после массовых update(); запрос просматривает все видимые
+    публикации, поэтому он выполняется командой publish_scheduled и
+    после массовых загрузок, а не из запросов лент.
+    """
+    now = now or timezone.now()
+    hidden = Post.objects.filter(is_visible=True).filter(
+        Q(is_published=False) | Q(pub_date__gt=now)
+    ).update(is_visible=False, updated_at=now)
+    if hidden:
+        _invalidate_changed(now)
+    return hidden
+
+
+def ensure_publication_lag():
+    """Запустить планировщик, если с прошлого запуска в этом процессе
+    прошло больше PUBLICATION_MAX_LAG секунд.
+
+    Так отложенная публикация появляется в лентах с опозданием не больше
+    PUBLICATION_MAX_LAG, даже без внешнего запуска publish_scheduled.
+    """
+    global _last_run
+    if time.monotonic() - _last_run < settings.PUBLICATION_MAX_LAG:
+        return
+    with _lock:
+        if time.monotonic() - _last_run < settings.PUBLICATION_MAX_LAG:
+            return
+        _last_run = time.monotonic()
+    publish_due_posts()
@@ -0,0 +1,179 @@
+"""Полнотекстовый поиск по публикациям.
+
+В SQLite индекс хранится в виртуальной таблице FTS5, куда пишутся уже
+приведённые к основам слова (snowball, как и словарь russian в Postgres).
+В PostgreSQL используется GIN-индекс по tsvector из миграции 0016.
+Фрагменты с подсветкой строятся в Python одинаково для обоих бэкендов.
+"""
+import re
+
+import snowballstemmer
+from django.conf import settings
+from django.db import connection
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+FTS_TABLE = 'blog_post_fts'
+
+# Выражение должно совпадать с индексом blog_post_search_idx, иначе
+# планировщик Postgres его не использует.
+PG_SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(text, '')), 'B')"
+)
+
+WORD_RE = re.compile(r'\w+')
+CYRILLIC_RE = re.compile('[а-яё]')
+
+_stemmers = {
+    'russian': snowballstemmer.stemmer('russian'),
+    'english': snowballstemmer.stemmer('english'),
+}
+
+
+def stem(word):
+    word = word.lower().replace('ё', 'е')
+    language = 'russian' if CYRILLIC_RE.search(word) else 'english'
+    return _stemmers[language].stemWord(word)
+
+
+def stem_text(text):
+    return ' '.join(stem(word) for word in WORD_RE.findall(text or ''))
+
+
+def get_scope(queryset):
+    """Подзапрос pk публикаций queryset и его параметры для IN (...)."""
+    if queryset is None:
+        return '', []
+    sql, params = queryset.values('pk').query.sql_with_params()
+    return sql, list(params)
+
+
+def get_query_stems(query):
+    """Основы слов запроса без повторов, в исходном порядке."""
+    return list(dict.fromkeys(
+        stem(word) for word in WORD_RE.findall(query or '')
+    ))
+
+
+class SQLiteBackend:
+
+    def index(self, post):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+                'VALUES (%s, %s, %s)',
+                [post.pk, stem_text(post.title), stem_text(post.text)]
+            )
+
+    def remove(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id]
+            )
+
+    def search(self, query, limit, queryset=None):
+        stems = get_query_stems(query)
+        if not stems:
+            return []
+        # Основы берутся как префиксы: snowball иногда отрезает от
+        # разных форм слова разное количество букв.
+        match = ' '.join(f'"{word}"*' for word in stems)
+        scope, scope_params = get_scope(queryset)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s '
+                + (f'AND rowid IN ({scope}) ' if scope else '')
+                + f'ORDER BY bm25({FTS_TABLE}, 10.0, 1.0) LIMIT %s',
+                [match, *scope_params, limit]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresBackend:
+    """Индекс — выражение по столбцам самой таблицы.
+
+    Его поддерживает сама база, поэтому отдельно обновлять ничего не нужно.
+    """
+
+    def index(self, post):
+        pass
+
+    def remove(self, post_id):
+        pass
+
+    def search(self, query, limit, queryset=None):
+        if not get_query_stems(query):
+            return []
+        scope, scope_params = get_scope(queryset)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT id FROM blog_post, '
+                f"websearch_to_tsquery('russian', %s) AS query "
+                f'WHERE ({PG_SEARCH_VECTOR}) @@ query '
+                + (f'AND id IN ({scope}) ' if scope else '')
+                + f'ORDER BY ts_rank({PG_SEARCH_VECTOR}, query) DESC, id DESC '
+                f'LIMIT %s',
+                [query, *scope_params, limit]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+def get_backend():
+    if connection.vendor == 'postgresql':
+        return PostgresBackend()
+    return SQLiteBackend()
+
+
+def index_post(post):
+    get_backend().index(post)
+
+
+def remove_post(post_id):
+    get_backend().remove(post_id)
+
+
+def search_post_ids(query, limit=None, queryset=None):
+    """Идентификаторы подходящих публикаций, лучшие — первыми.
+
+    queryset ограничивает поиск своими публикациями прямо в запросе,
+    до LIMIT, чтобы скрытые записи не занимали места в выдаче.
+    """
+    return get_backend().search(
+        query, limit or settings.SEARCH_MAX_RESULTS, queryset
+    )
+
+
+def make_snippet(text, stems, length=None):
+    """Фрагмент text вокруг первого совпадения со словами <mark>."""
+    length = length or settings.SEARCH_SNIPPET_WORDS
+    words = list(WORD_RE.finditer(text))
+
+    def matches(word):
+        word_stem = stem(word.group())
+        return any(word_stem.startswith(query) for query in stems)
+
+    first = next(
+        (position for position, word in enumerate(words) if matches(word)),
+        0
+    )
+    start = max(first - length // 3, 0)
+    window = words[start:start + length]
+    if not window:
+        return ''
+
+    parts, cursor = [], window[0].start()
+    for word in window:
+        parts.append(escape(text[cursor:word.start()]))
+        if matches(word):
+            parts.append(f'<mark>{escape(word.group())}</mark>')
+        else:
+            parts.append(escape(word.group()))
+        cursor = word.end()
+    prefix = '… ' if start else ''
+    suffix = ' …' if start + length < len(words) else ''
+    return mark_safe(prefix + ''.join(parts) + suffix)
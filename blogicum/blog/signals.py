@@ -0,0 +1,142 @@
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_feed_generation
+from .lookups import bump_lookup_generation
+from .models import Category, Comment, Location, Post
+from .search import index_post, remove_post
+from .sitemaps import invalidate, invalidate_posts
+from .sqlite import apply_pragmas
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1, updated_at=timezone.now()
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1, updated_at=timezone.now()
+    )
+
+
+# Столбцы категорий и местоположений, которые попадают в выгрузку
+# публикаций и комментариев (blog.exports).
+EXPORTED_FIELDS = {
+    Category: ('slug', 'title'),
+    Location: ('name',),
+}
+
+
+def touch_exported_rows(sender, instance):
+    """Сдвинуть updated_at публикаций и комментариев категории или места,
+    чтобы инкрементальная выгрузка по updated_at их не пропустила.
+    """
+    field = 'category' if sender is Category else 'location'
+    now = timezone.now()
+    Post.objects.filter(**{field: instance}).update(updated_at=now)
+    Comment.objects.filter(**{f'post__{field}': instance}).update(
+        updated_at=now
+    )
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Location)
+def remember_exported_values(sender, instance, raw=False, update_fields=None,
+                             **kwargs):
+    fields = EXPORTED_FIELDS[sender]
+    instance._exported_values = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not set(fields) & set(update_fields):
+        return
+    instance._exported_values = sender.objects.filter(
+        pk=instance.pk
+    ).values_list(*fields).first()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+def touch_rows_on_rename(sender, instance, created, raw=False, **kwargs):
+    old = getattr(instance, '_exported_values', None)
+    if created or raw or old is None:
+        return
+    new = tuple(getattr(instance, name) for name in EXPORTED_FIELDS[sender])
+    if new != old:
+        touch_exported_rows(sender, instance)
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Location)
+def touch_rows_on_delete(sender, instance, **kwargs):
+    touch_exported_rows(sender, instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_feed_pages(sender, **kwargs):
+    bump_feed_generation()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_lookups(sender, **kwargs):
+    bump_lookup_generation()
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or {'title', 'text'} & set(update_fields):
+        index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, **kwargs):
+    remove_post(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_sitemaps(sender, instance, **kwargs):
+    invalidate_posts([(instance.pk, instance.author_id)])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_sitemaps(sender, instance, **kwargs):
+    # От публикации категории зависит видимость всех её публикаций.
+    invalidate('categories', [instance.pk])
+    invalidate('posts')
+    invalidate('profiles')
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_profile_sitemaps(
+        sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate('profiles', [instance.pk])
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    apply_pragmas(connection)
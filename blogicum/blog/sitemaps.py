@@ -0,0 +1,214 @@
+"""Карта сайта: индекс и файлы разделов, разбитые по диапазонам id.
+
+Файл раздела section-N.xml содержит объекты с id от N * SITEMAP_CHUNK_SIZE
+до (N + 1) * SITEMAP_CHUNK_SIZE, поэтому в нём не больше 50 000 адресов
+и изменение одной записи затрагивает ровно один файл. Готовые файлы
+лежат на диске в SITEMAP_ROOT и удаляются сигналами, а строятся заново
+при следующем запросе потоковым обходом базы.
+"""
+import os
+import re
+import tempfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import (
+    Exists, ExpressionWrapper, F, IntegerField, Max, OuterRef, Subquery
+)
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.urls import reverse
+
+from .models import Category
+from .query_func import get_optimized_queryset, iterate_by_pk
+
+INDEX_NAME = 'index.xml'
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def get_chunk(pk):
+    return pk // settings.SITEMAP_CHUNK_SIZE
+
+
+class PostSection:
+    name = 'posts'
+    chunk_key = 'pk'
+
+    def get_rows(self):
+        """values_list видимых объектов раздела; первое поле — pk."""
+        return get_optimized_queryset().values_list('pk', 'updated_at')
+
+    def get_location(self, row):
+        return reverse('blog:post_detail', args=[row[0]]), row[1]
+
+    def get_chunk_source(self):
+        """Записи, по id (chunk_key) и updated_at которых строится индекс."""
+        return get_optimized_queryset()
+
+
+class CategorySection:
+    name = 'categories'
+    chunk_key = 'pk'
+
+    def get_rows(self):
+        return Category.objects.filter(is_published=True).values_list(
+            'pk', 'slug', 'updated_at'
+        )
+
+    def get_location(self, row):
+        return reverse('blog:category_posts', args=[row[1]]), row[2]
+
+    def get_chunk_source(self):
+        return Category.objects.filter(is_published=True)
+
+
+class ProfileSection:
+    """Профили авторов, у которых есть хотя бы одна видимая публикация."""
+
+    name = 'profiles'
+    chunk_key = 'author_id'
+
+    def get_rows(self):
+        posts = get_optimized_queryset().filter(author=OuterRef('pk'))
+        return get_user_model().objects.filter(Exists(posts)).annotate(
+            lastmod=Subquery(
+                posts.order_by('-updated_at').values('updated_at')[:1]
+            )
+        ).values_list('pk', 'username', 'lastmod')
+
+    def get_location(self, row):
+        return reverse('blog:profile', args=[row[1]]), row[2]
+
+    def get_chunk_source(self):
+        return get_optimized_queryset()
+
+
+SECTIONS = {
+    section.name: section
+    for section in (PostSection(), CategorySection(), ProfileSection())
+}
+
+
+def get_cache_dir(request):
+    host = re.sub(r'[^\w.-]', '_', f'{request.scheme}_{request.get_host()}')
+    return Path(settings.SITEMAP_ROOT) / host
+
+
+def write_atomic(path, lines):
+    """Записать файл построчно и подменить старый одной операцией."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as temp:
+            temp.writelines(lines)
+        os.replace(temp_name, path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+def format_entry(tag, location, lastmod):
+    lastmod = f'<lastmod>{lastmod.isoformat()}</lastmod>' if lastmod else ''
+    return f'<{tag}><loc>{escape(location)}</loc>{lastmod}</{tag}>\n'
+
+
+def generate_index(request):
+    yield XML_HEADER
+    yield f'<sitemapindex xmlns="{XMLNS}">\n'
+    for name, section in SECTIONS.items():
+        chunks = section.get_chunk_source().annotate(
+            chunk=ExpressionWrapper(
+                F(section.chunk_key) / settings.SITEMAP_CHUNK_SIZE,
+                output_field=IntegerField()
+            )
+        ).values('chunk').annotate(
+            lastmod=Max('updated_at')
+        ).order_by('chunk')
+        for row in chunks:
+            location = request.build_absolute_uri(reverse(
+                'blog:sitemap_section',
+                kwargs={'section': name, 'chunk': row['chunk']}
+            ))
+            yield format_entry('sitemap', location, row['lastmod'])
+    yield '</sitemapindex>\n'
+
+
+def get_chunk_rows(section, chunk):
+    size = settings.SITEMAP_CHUNK_SIZE
+    return section.get_rows().filter(
+        pk__gte=chunk * size, pk__lt=(chunk + 1) * size
+    )
+
+
+def has_rows(section, chunk):
+    return get_chunk_rows(section, chunk).exists()
+
+
+def generate_section(request, section, chunk):
+    rows = get_chunk_rows(section, chunk)
+    yield XML_HEADER
+    yield f'<urlset xmlns="{XMLNS}">\n'
+    for row in iterate_by_pk(rows):
+        location, lastmod = section.get_location(row)
+        yield format_entry(
+            'url', request.build_absolute_uri(location), lastmod
+        )
+    yield '</urlset>\n'
+
+
+def serve(path, lines):
+    if not path.exists():
+        write_atomic(path, lines)
+    return FileResponse(path.open('rb'), content_type='application/xml')
+
+
+def get_last_chunk(section):
+    last = section.get_chunk_source().aggregate(last=Max(section.chunk_key))
+    return None if last['last'] is None else get_chunk(last['last'])
+
+
+def sitemap_index(request):
+    path = get_cache_dir(request) / INDEX_NAME
+    return serve(path, generate_index(request))
+
+
+def sitemap_section(request, section, chunk):
+    if section not in SECTIONS:
+        raise Http404
+    path = get_cache_dir(request) / f'{section}-{chunk}.xml'
+    if path.exists():
+        return serve(path, ())
+    # Файлы пишутся на диск, поэтому номер из URL сверяется с базой:
+    # иначе любой клиент мог бы создать сколько угодно файлов.
+    section = SECTIONS[section]
+    last_chunk = get_last_chunk(section)
+    if last_chunk is None or chunk > last_chunk:
+        raise Http404
+    lines = generate_section(request, section, chunk)
+    if not has_rows(section, chunk):
+        # Опустевший раздел (например, после удаления записей) отдаётся,
+        # но не сохраняется.
+        return StreamingHttpResponse(lines, content_type='application/xml')
+    return serve(path, lines)
+
+
+def invalidate(section, pks=None):
+    """Удалить индекс и файлы раздела с указанными id; без pks — все."""
+    root = Path(settings.SITEMAP_ROOT)
+    if pks is None:
+        names = [f'{section}-*.xml']
+    else:
+        chunks = {get_chunk(pk) for pk in pks}
+        names = [f'{section}-{chunk}.xml' for chunk in chunks]
+    for name in [INDEX_NAME, *names]:
+        for path in root.glob(f'*/{name}'):
+            path.unlink(missing_ok=True)
+
+
+def invalidate_posts(rows):
+    """Сбросить файлы с публикациями и их авторами; rows — (pk, author_id)."""
+    rows = list(rows)
+    invalidate(PostSection.name, [pk for pk, _ in rows])
+    invalidate(ProfileSection.name, [author_id for _, author_id in rows])
@@ -0,0 +1,20 @@
+"""Настройка соединений SQLite через PRAGMA из SQLITE_PRAGMAS.
+
+WAL позволяет читать базу, пока другое соединение пишет в неё:
+читатели не ждут, пока сохранится комментарий. Для базы в памяти
+(тесты) journal_mode и mmap_size не имеют смысла и пропускаются.
+"""
+from django.conf import settings
+
+FILE_ONLY_PRAGMAS = {'journal_mode', 'mmap_size'}
+
+
+def apply_pragmas(connection):
+    if connection.vendor != 'sqlite':
+        return
+    in_memory = connection.is_in_memory_db()
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            if in_memory and name in FILE_ONLY_PRAGMAS:
+                continue
+            cursor.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,134 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .images import process_post_image
+from .models import ImageJob
+
+logger = logging.getLogger(__name__)
+
+SYNC_MODE = 'sync'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_WORKER_THREADS,
+                thread_name_prefix='blog-images'
+            )
+    return _executor
+
+
+def enqueue_image_job(post):
+    """Поставить обработку фото в очередь после фиксации транзакции."""
+    job = ImageJob.objects.create(post=post)
+    if settings.IMAGE_WORKER_MODE == SYNC_MODE:
+        transaction.on_commit(lambda: run_image_job(job.pk))
+    else:
+        transaction.on_commit(
+            lambda: get_executor().submit(run_in_worker, job.pk)
+        )
+    return job
+
+
+def run_in_worker(job_pk):
+    try:
+        delay = attempt_image_job(job_pk)
+    except Exception:
+        logger.exception('Задача обработки фото %s упала', job_pk)
+        delay = None
+    finally:
+        close_old_connections()
+    if delay is not None:
+        # Поток пула не ждёт паузы: повтор ставится в очередь по таймеру.
+        timer = threading.Timer(
+            delay, lambda: get_executor().submit(run_in_worker, job_pk)
+        )
+        timer.daemon = True
+        timer.start()
+
+
+def _claimable():
+    """Задачи, которые можно взять: в очереди, упавшие и зависшие.
+
+    Задача в статусе RUNNING дольше IMAGE_JOB_TIMEOUT осталась от
+    процесса, который упал или был перезапущен посреди обработки.
+    """
+    stale = timezone.now() - timedelta(seconds=settings.IMAGE_JOB_TIMEOUT)
+    return (
+        Q(status__in=(ImageJob.PENDING, ImageJob.FAILED))
+        | Q(status=ImageJob.RUNNING, updated_at__lt=stale)
+    )
+
+
+def _claim(job_pk):
+    return ImageJob.objects.filter(
+        _claimable(),
+        pk=job_pk,
+        attempts__lt=settings.IMAGE_JOB_MAX_ATTEMPTS
+    ).update(
+        status=ImageJob.RUNNING, attempts=F('attempts') + 1,
+        updated_at=timezone.now()
+    )
+
+
+def attempt_image_job(job_pk):
+    """Одна попытка выполнить задачу.
+
+    Возвращает паузу в секундах перед повтором или None, если задача
+    выполнена, попытки исчерпаны или её взял другой обработчик.
+    """
+    if not _claim(job_pk):
+        return None
+    job = ImageJob.objects.select_related('post').filter(pk=job_pk).first()
+    if job is None:
+        return None
+    try:
+        if not process_post_image(job.post):
+            raise OSError(f'Не удалось обработать {job.post.image.name}')
+    except Exception as error:
+        logger.warning('Обработка фото %s: %s', job_pk, error)
+        job.status = ImageJob.FAILED
+        job.last_error = str(error)
+        job.save(update_fields=('status', 'last_error', 'updated_at'))
+        if job.attempts >= settings.IMAGE_JOB_MAX_ATTEMPTS:
+            return None
+        return settings.IMAGE_JOB_RETRY_DELAY * job.attempts
+    job.status = ImageJob.DONE
+    job.last_error = ''
+    job.save(update_fields=('status', 'last_error', 'updated_at'))
+    return None
+
+
+def run_image_job(job_pk):
+    """Выполнить задачу в текущем потоке, повторяя её до
+    IMAGE_JOB_MAX_ATTEMPTS раз; для режима sync и команды
+    process_image_jobs, где ожидание никого не задерживает.
+    """
+    while (delay := attempt_image_job(job_pk)) is not None:
+        time.sleep(delay)
+
+
+def run_pending_image_jobs():
+    """Доделать задачи, оставшиеся в очереди или зависшие после
+    перезапуска процесса.
+    """
+    jobs = list(ImageJob.objects.filter(
+        _claimable(),
+        attempts__lt=settings.IMAGE_JOB_MAX_ATTEMPTS
+    ).values_list('pk', flat=True))
+    for job_pk in jobs:
+        run_image_job(job_pk)
+    return len(jobs)
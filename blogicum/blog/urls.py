@@ -1,12 +1,24 @@
+from django.conf import settings
 from django.urls import path, include
 
-from . import views
+from . import api, async_views, exports, feeds, sitemaps, views
+
+if settings.ASYNC_VIEWS:
+    index_view = async_views.index
+    post_detail_view = async_views.post_detail
+    category_posts_view = async_views.category_posts
+    profile_view = async_views.profile
+else:
+    index_view = views.index
+    post_detail_view = views.post_detail
+    category_posts_view = views.category_posts
+    profile_view = views.ProfileListView.as_view()
 
 app_name = 'blog'
 
 post_urls = [
     path('create/', views.PostCreateView.as_view(), name='create_post'),
-    path('<int:post_id>/', views.post_detail, name='post_detail'),
+    path('<int:post_id>/', post_detail_view, name='post_detail'),
     path(
         '<int:post_id>/edit/',
         views.PostUpdateView.as_view(),
@@ -34,17 +46,51 @@ post_urls = [
     )
 ]
 
+api_urls = [
+    path('posts/', api.post_list, name='api_post_list'),
+    path('posts/<int:post_id>/', api.post_detail, name='api_post_detail'),
+    path('categories/', api.category_list, name='api_category_list'),
+    path(
+        'authors/<str:username>/posts/',
+        api.author_posts,
+        name='api_author_posts'
+    ),
+]
+
 urlpatterns = [
-    path('', views.index, name='index'),
+    path('', index_view, name='index'),
+    path('feed/', feeds.PostFeed(), name='feed'),
+    path('feed/atom/', feeds.PostAtomFeed(), name='feed_atom'),
     path('posts/', include(post_urls)),
-    path('category/<slug:category_slug>/', views.category_posts,
+    path('category/<slug:category_slug>/', category_posts_view,
          name='category_posts'),
+    path('category/<slug:category_slug>/feed/', feeds.CategoryFeed(),
+         name='category_feed'),
+    path('category/<slug:category_slug>/feed/atom/',
+         feeds.CategoryAtomFeed(), name='category_feed_atom'),
     path(
         'profile/<str:username>/edit/',
         views.ProfileUpdateView.as_view(),
         name='edit_profile'),
     path(
         'profile/<str:username>/',
-        views.ProfileListView.as_view(),
-        name='profile')
+        profile_view,
+        name='profile'),
+    path(
+        'profile/<str:username>/feed/',
+        feeds.AuthorFeed(),
+        name='author_feed'),
+    path(
+        'profile/<str:username>/feed/atom/',
+        feeds.AuthorAtomFeed(),
+        name='author_feed_atom'),
+    path('api/', include(api_urls)),
+    path('sitemap.xml', sitemaps.sitemap_index, name='sitemap'),
+    path(
+        'sitemap-<slug:section>-<int:chunk>.xml',
+        sitemaps.sitemap_section,
+        name='sitemap_section'),
+    path('search/', views.search, name='search'),
+    path('metrics/', views.metrics, name='metrics'),
+    path('export/<slug:resource>/', exports.export, name='export'),
 ]
@@ -1,20 +1,33 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.paginator import Paginator
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse, reverse_lazy
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.utils.http import urlencode
+from django.views.decorators.http import condition
 
 from django.views.generic import (
     CreateView, UpdateView, DeleteView, ListView
 )
 
+from .cache import cache_feed_page
+from .conditional import category_etag, index_etag, post_etag, profile_etag
 from .forms import PostForm, CommentForm, UserUpdateForm
+from .instrumentation import cache_stats, histogram
 from .mixins import OnlyAuthorMixin, PostMixin, CommentMixin, UpdDelCommMixin
 from .models import Post, Category
-from .query_func import get_optimized_queryset
-from .paginate import get_paginator
+from .query_func import (
+    get_detail_queryset, get_optimized_queryset, is_post_visible
+)
+from .paginate import CURSOR_MODE, get_paginator
+from .search import get_query_stems, make_snippet, search_post_ids
 
 
+@method_decorator(condition(etag_func=profile_etag), name='dispatch')
 class ProfileListView(ListView):
     model = get_user_model()
     slug_field = 'username'
@@ -32,15 +45,21 @@ class ProfileListView(ListView):
     def get_queryset(self):
         queryset = get_optimized_queryset(
             manager=self.profile.posts,
-            filters=(self.request.user != self.profile),
-            annotations=True
+            filters=(self.request.user != self.profile)
         )
 
         return queryset
 
+    def get_paginate_by(self, queryset):
+        if settings.PAGINATION_MODE == CURSOR_MODE:
+            return None
+        return super().get_paginate_by(queryset)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['profile'] = self.profile
+        if settings.PAGINATION_MODE == CURSOR_MODE:
+            context.update(get_paginator(self.request, self.object_list))
         return context
 
 
@@ -61,9 +80,11 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         )
 
 
+@cache_feed_page
+@condition(etag_func=index_etag)
 def index(request):
     template_name = 'blog/index.html'
-    post_list = get_optimized_queryset(filters=True, annotations=True)
+    post_list = get_optimized_queryset(filters=True)
     context = get_paginator(request, post_list)
     return render(request, template_name, context)
 
@@ -110,29 +131,30 @@ class PostDeleteView(
 def post_detail(request, post_id):
     template_name = 'blog/detail.html'
 
-    queryset = get_optimized_queryset(filters=False, annotations=False)
-
+    queryset = get_detail_queryset()
     post = get_object_or_404(queryset, pk=post_id)
 
-    if request.user != post.author:
-        queryset_with_filter = get_optimized_queryset(
-            filters=True,
-            annotations=False
-        )
-        post = get_object_or_404(queryset_with_filter, pk=post_id)
+    if post.author_id != request.user.pk and not is_post_visible(post):
+        raise Http404
+
+    etag = post_etag(request, post)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
 
-    comments = post.comments.all().order_by(
-        'created_at'
-    ).select_related('author')
     form = CommentForm()
     context = {
         'post': post,
-        'comments': comments,
+        'comments': post.comments.select_related('author'),
         'form': form
     }
-    return render(request, template_name, context)
+    response = render(request, template_name, context)
+    response['ETag'] = etag
+    return response
 
 
+@cache_feed_page
+@condition(etag_func=category_etag)
 def category_posts(request, category_slug):
     template_name = 'blog/category.html'
     category = get_object_or_404(
@@ -142,8 +164,7 @@ def category_posts(request, category_slug):
     )
     post_list = get_optimized_queryset(
         manager=category.posts,
-        filters=True,
-        annotations=True
+        filters=True
     )
     context = {
         **get_paginator(request, post_list),
@@ -175,3 +196,36 @@ class CommentDeleteView(
     CommentMixin, UpdDelCommMixin, DeleteView
 ):
     pk_url_kwarg = 'comment_id'
+
+
+def search(request):
+    template_name = 'blog/search.html'
+    query = request.GET.get('q', '').strip()
+    context = {'query': query}
+    if query:
+        found = search_post_ids(
+            query, queryset=get_optimized_queryset(filters=True)
+        )
+        page_obj = Paginator(found, settings.NUM_OF_POSTS).get_page(
+            request.GET.get('page')
+        )
+        posts = get_optimized_queryset(filters=False).in_bulk(
+            page_obj.object_list
+        )
+        stems = get_query_stems(query)
+        page_obj.object_list = [posts[pk] for pk in page_obj.object_list]
+        for post in page_obj.object_list:
+            post.snippet = make_snippet(post.text, stems)
+        context.update(
+            page_obj=page_obj,
+            page_query=urlencode({'q': query}) + '&'
+        )
+    return render(request, template_name, context)
+
+
+def metrics(request):
+    if not request.user.is_staff:
+        raise Http404
+    return JsonResponse({
+        **histogram.snapshot(), 'cache': cache_stats.snapshot()
+    })
@@ -0,0 +1,57 @@
+"""Настройки кэша из переменных окружения.
+
+BLOGICUM_CACHE_BACKEND:
+    locmem (по умолчанию) — в памяти процесса; у каждого воркера свой;
+    file — каталог CACHE_LOCATION (по умолчанию cache/ рядом с
+    manage.py), общий для процессов одной машины;
+    redis — сервер REDIS_URL, общий для всех воркеров; нужен пакет
+    redis, который в requirements.txt не входит.
+
+CACHE_KEY_PREFIX и CACHE_VERSION попадают в каждый ключ: несколько
+проектов могут делить один Redis, а смена CACHE_VERSION разом делает
+недействительным весь кэш. Бэкенды — обёртки из blog.instrumentation,
+считающие попадания и промахи по семействам ключей.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+LOCMEM = 'locmem'
+FILE = 'file'
+REDIS = 'redis'
+
+BACKENDS = {
+    LOCMEM: 'blog.instrumentation.LocMemCache',
+    FILE: 'blog.instrumentation.FileBasedCache',
+    REDIS: 'blog.instrumentation.RedisCache',
+}
+
+
+def get_location(engine, base_dir, environ):
+    if engine == FILE:
+        return environ.get('CACHE_LOCATION', str(base_dir / 'cache'))
+    if engine == REDIS:
+        return environ.get('REDIS_URL', 'redis://localhost:6379/1')
+    return environ.get('CACHE_LOCATION', 'blogicum')
+
+
+def get_caches(base_dir, environ=os.environ):
+    engine = environ.get('BLOGICUM_CACHE_BACKEND', LOCMEM)
+    if engine not in BACKENDS:
+        raise ImproperlyConfigured(
+            f'BLOGICUM_CACHE_BACKEND должен быть одним из '
+            f'{", ".join(BACKENDS)}, а не {engine!r}.'
+        )
+    cache = {
+        'BACKEND': BACKENDS[engine],
+        'LOCATION': get_location(engine, base_dir, environ),
+        'TIMEOUT': int(environ.get('CACHE_TIMEOUT', 300)),
+        'KEY_PREFIX': environ.get('CACHE_KEY_PREFIX', 'blogicum'),
+        'VERSION': int(environ.get('CACHE_VERSION', 1)),
+    }
+    if engine in (LOCMEM, FILE):
+        # Карточек публикаций намного больше 300 записей по умолчанию.
+        cache['OPTIONS'] = {
+            'MAX_ENTRIES': int(environ.get('CACHE_MAX_ENTRIES', 10000)),
+        }
+    return {'default': cache}
@@ -0,0 +1,93 @@
+"""Настройки базы данных из переменных окружения.
+
+BLOGICUM_DB_ENGINE:
+    sqlite (по умолчанию) — файл db.sqlite3 рядом с manage.py;
+    postgresql — сервер из POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB,
+    POSTGRES_USER, POSTGRES_PASSWORD;
+    auto — PostgreSQL, если он отвечает, иначе SQLite (удобно для
+    запуска тестов на машине, где сервер может и не работать).
+
+Пула соединений в Django 4.2 нет (он появился в 5.1), поэтому каждый
+процесс держит постоянное соединение (POSTGRES_CONN_MAX_AGE) с
+проверкой перед использованием. За PgBouncer в режиме transaction
+нужно выставить POSTGRES_PGBOUNCER=1: серверные курсоры и подготовленные
+выражения там не переживают смену соединения.
+"""
+import os
+from importlib.util import find_spec
+
+from django.core.exceptions import ImproperlyConfigured
+
+SQLITE = 'sqlite'
+POSTGRESQL = 'postgresql'
+AUTO = 'auto'
+
+
+def sqlite_database(base_dir, environ=os.environ):
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': environ.get('SQLITE_PATH', base_dir / 'db.sqlite3'),
+    }
+
+
+def postgresql_database(environ=os.environ):
+    behind_pgbouncer = environ.get('POSTGRES_PGBOUNCER') == '1'
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': environ.get('POSTGRES_DB', 'blogicum'),
+        'USER': environ.get('POSTGRES_USER', 'blogicum'),
+        'PASSWORD': environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': environ.get('POSTGRES_HOST', 'localhost'),
+        'PORT': environ.get('POSTGRES_PORT', '5432'),
+        'CONN_MAX_AGE': int(environ.get('POSTGRES_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        # .iterator() читает большие выборки серверным курсором порциями.
+        'DISABLE_SERVER_SIDE_CURSORS': behind_pgbouncer,
+        'OPTIONS': {
+            'connect_timeout': int(environ.get('POSTGRES_CONNECT_TIMEOUT', 5)),
+        },
+    }
+    if find_spec('psycopg') is not None:
+        # psycopg 3 готовит выражение на сервере после N выполнений
+        # в одном соединении; None отключает подготовку.
+        database['OPTIONS']['prepare_threshold'] = (
+            None if behind_pgbouncer
+            else int(environ.get('POSTGRES_PREPARE_THRESHOLD', 5))
+        )
+    return database
+
+
+def postgresql_available(database):
+    """Отвечает ли сервер; драйвер может быть и не установлен."""
+    try:
+        import psycopg as driver
+    except ImportError:
+        try:
+            import psycopg2 as driver
+        except ImportError:
+            return False
+    try:
+        driver.connect(
+            dbname='postgres', user=database['USER'],
+            password=database['PASSWORD'], host=database['HOST'],
+            port=database['PORT'], connect_timeout=1,
+        ).close()
+    except driver.Error:
+        return False
+    return True
+
+
+def get_databases(base_dir, environ=os.environ):
+    engine = environ.get('BLOGICUM_DB_ENGINE', SQLITE)
+    if engine not in (SQLITE, POSTGRESQL, AUTO):
+        raise ImproperlyConfigured(
+            f'BLOGICUM_DB_ENGINE должен быть {SQLITE}, {POSTGRESQL} '
+            f'или {AUTO}, а не {engine!r}.'
+        )
+    if engine == POSTGRESQL:
+        return {'default': postgresql_database(environ)}
+    if engine == AUTO:
+        database = postgresql_database(environ)
+        if postgresql_available(database):
+            return {'default': database}
+    return {'default': sqlite_database(base_dir, environ)}
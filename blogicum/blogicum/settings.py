@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from .caches import get_caches
+from .database import get_databases
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -43,10 +47,10 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django_bootstrap5',
-    'debug_toolbar',
 ]
 
 MIDDLEWARE = [
+    'blog.instrumentation.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,9 +58,12 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+if DEBUG:
+    INSTALLED_APPS += ['debug_toolbar']
+    MIDDLEWARE += ['debug_toolbar.middleware.DebugToolbarMiddleware']
+
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
@@ -66,7 +73,8 @@ ROOT_URLCONF = 'blogicum.urls'
 TEMPLATES_DIR = BASE_DIR / 'templates'
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'blog.instrumentation.DjangoTemplates',
+        'NAME': 'django',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -82,16 +90,27 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
+# Компилировать все шаблоны при старте процесса (см. blogicum/warmup.py).
+TEMPLATE_WARMUP = False
+
 
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
+# Движок и параметры подключения задаются переменными окружения,
+# см. blogicum/database.py.
+DATABASES = get_databases(BASE_DIR)
+
+# Кэш: locmem, файлы или Redis — см. blogicum/caches.py.
+CACHES = get_caches(BASE_DIR)
+
+# Версия ключей данных блога (blog.cache.make_key): увеличить, если
+# изменился формат того, что лежит в кэше.
+BLOG_CACHE_VERSION = 1
+
+# PRAGMA для каждого нового соединения SQLite (blog/sqlite.py).
+# Рабочий профиль — в settings_production.py.
+SQLITE_PRAGMAS = {}
 
 
 # Password validation
@@ -151,4 +170,93 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Ширины уменьшенных копий фото публикаций, px: для карточки в ленте
+# и для страницы публикации.
+POST_IMAGE_VARIANTS = {
+    'card': 640,
+    'detail': 1280,
+}
+
+# Копии фото строятся в фоне: 'thread' — пул потоков в процессе,
+# 'sync' — сразу после фиксации транзакции (для отладки и тестов).
+IMAGE_WORKER_MODE = 'thread'
+IMAGE_WORKER_THREADS = 2
+IMAGE_JOB_MAX_ATTEMPTS = 3
+# Пауза перед повтором, с; умножается на номер попытки.
+IMAGE_JOB_RETRY_DELAY = 5
+# Через сколько секунд задача в статусе «Выполняется» считается брошенной
+# упавшим процессом и снова берётся в работу.
+IMAGE_JOB_TIMEOUT = 600
+
 NUM_OF_POSTS = 10
+
+# Асинхронные ленты и страница публикации (blog/async_views.py) вместо
+# синхронных. blogicum/asgi.py включает их по умолчанию.
+ASYNC_VIEWS = os.environ.get('BLOGICUM_ASYNC_VIEWS') == '1'
+
+# 'pages' — нумерованные страницы (?page=), 'cursor' — ключевая пагинация
+# по (pub_date, id) с непрозрачными курсорами (?cursor=).
+PAGINATION_MODE = 'pages'
+
+# Сколько секунд страница ленты хранится в кэше для анонимных
+# пользователей; срок сокращается до ближайшей отложенной публикации.
+FEED_CACHE_TIMEOUT = 60 * 5
+
+# RSS/Atom (blog/feeds.py): сколько последних публикаций отдавать
+# и до скольких слов сокращать их текст.
+FEED_ITEMS = 20
+FEED_DESCRIPTION_WORDS = 50
+
+# JSON API (blog/api.py): размер страницы по умолчанию и наибольший
+# размер, который можно запросить параметром ?limit=.
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+
+# Выгрузка для аналитики (blog/exports.py): сколько записей читать
+# из базы за один запрос.
+EXPORT_CHUNK_SIZE = 2000
+
+# Карта сайта (blog/sitemaps.py): куда складывать готовые файлы и сколько
+# id покрывает один файл раздела (протокол допускает до 50 000 адресов).
+SITEMAP_ROOT = BASE_DIR / 'sitemap_cache'
+SITEMAP_CHUNK_SIZE = 50000
+
+# Сколько секунд справочники категорий и местоположений (blog/lookups.py)
+# живут в памяти процесса. С общим кэшем изменения видны сразу, с
+# locmem у каждого процесса — не позже этого срока.
+LOOKUP_CACHE_TIMEOUT = 60
+
+# Наибольшая задержка, с, с которой отложенная публикация появляется
+# в лентах (см. blog/scheduler.py).
+PUBLICATION_MAX_LAG = 30
+
+# Поиск (blog/search.py): сколько лучших совпадений показывать и сколько
+# слов оставлять во фрагменте с подсветкой.
+SEARCH_MAX_RESULTS = 500
+SEARCH_SNIPPET_WORDS = 30
+
+# Метрики запросов (blog/instrumentation.py): сколько последних замеров
+# хранить на каждое представление и сколько SQL-запросов допустимо,
+# прежде чем в лог уйдёт предупреждение.
+METRICS_WINDOW = 1000
+VIEW_QUERY_BUDGETS = {
+    'blog:index': 4,
+    'blog:category_posts': 5,
+    'blog:profile': 6,
+    'blog:post_detail': 3,
+    'blog:search': 4,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'blog.metrics': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
+}
@@ -0,0 +1,57 @@
+"""
+Production settings for blogicum project.
+
+Templates are served by the cached loader and compiled once at process
+start (see blogicum/warmup.py). SQLite runs in WAL mode with persistent
+connections so readers are not blocked by comment writes.
+"""
+
+from .settings import *  # noqa: F401, F403
+from .settings import DATABASES, INSTALLED_APPS, MIDDLEWARE, TEMPLATES
+
+DEBUG = False
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'debug_toolbar']
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if not middleware.startswith('debug_toolbar')
+]
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+TEMPLATE_WARMUP = True
+
+DATABASES = {
+    **DATABASES,
+    'default': {
+        **DATABASES['default'],
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    },
+}
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    # В режиме WAL NORMAL не рискует целостностью базы, а fsync
+    # выполняется только при контрольных точках.
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение — размер в КиБ: 64 МиБ на соединение.
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+    'temp_store': 'memory',
+}
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+
+
+def warm_up_templates():
+    """Скомпилировать все шаблоны проекта, заполнив кэш загрузчика."""
+    engine = engines['django'].engine
+    compiled = 0
+    template_dirs = (*engine.dirs, *get_app_template_dirs('templates'))
+    for template_dir in template_dirs:
+        for path in sorted(Path(template_dir).rglob('*.html')):
+            engine.get_template(path.relative_to(template_dir).as_posix())
+            compiled += 1
+    return compiled
+
+
+def warm_up():
+    if getattr(settings, 'TEMPLATE_WARMUP', False):
+        warm_up_templates()
@@ -41,6 +41,16 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    from blog.lookups import clear_lookups
+    cache.clear()
+    clear_lookups()
+    yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -92,6 +102,7 @@ pytest_plugins = [
     "fixtures.locations",
     "fixtures.categories",
     "fixtures.comments",
+    "fixtures.caches",
     "adapters.comment",
 ]
 
@@ -363,6 +374,7 @@ def cleanup(request):
                     filename.endswith(".jpg")
                     or filename.endswith(".gif")
                     or filename.endswith(".png")
+                    or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
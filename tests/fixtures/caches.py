@@ -0,0 +1,153 @@
+"""Redis в памяти процесса и фикстура, запускающая тест на каждом кэше.
+
+FakeRedisCache — настоящий RedisCache Django: ключи, таймауты и
+сериализация проходят через RedisCacheClient, а вместо клиента redis-py
+подставляется словарь, понимающий команды, которые этот клиент шлёт.
+"""
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCacheClient, RedisSerializer
+
+from blog.instrumentation import RedisCache, cache_stats
+
+
+class FakeRedis:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._data = {}
+        self._expires = {}
+
+    def _alive(self, key):
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            del self._data[key], self._expires[key]
+        return key in self._data
+
+    def get(self, key):
+        with self._lock:
+            return self._data[key] if self._alive(key) else None
+
+    def set(self, key, value, ex=None, nx=False):
+        with self._lock:
+            if nx and self._alive(key):
+                return None
+            self._data[key] = (
+                value if isinstance(value, bytes) else str(value).encode()
+            )
+            self._expires.pop(key, None)
+            if ex is not None:
+                self._expires[key] = time.monotonic() + ex
+            return True
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def mset(self, mapping):
+        for key, value in mapping.items():
+            self.set(key, value)
+        return True
+
+    def delete(self, *keys):
+        with self._lock:
+            deleted = [key for key in keys if self._alive(key)]
+            for key in deleted:
+                del self._data[key]
+                self._expires.pop(key, None)
+            return len(deleted)
+
+    def exists(self, *keys):
+        with self._lock:
+            return sum(self._alive(key) for key in keys)
+
+    def expire(self, key, seconds):
+        with self._lock:
+            if not self._alive(key):
+                return False
+            if seconds <= 0:
+                return bool(self.delete(key))
+            self._expires[key] = time.monotonic() + seconds
+            return True
+
+    def persist(self, key):
+        with self._lock:
+            alive = self._alive(key)
+            return alive and self._expires.pop(key, None) is not None
+
+    def incr(self, key, amount=1):
+        with self._lock:
+            value = int(self.get(key) or 0) + amount
+            self._data[key] = str(value).encode()
+            return value
+
+    def flushdb(self):
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            return True
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._commands.append((getattr(self._redis, name), args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        commands, self._commands = self._commands, []
+        return [command(*args, **kwargs) for command, args, kwargs in commands]
+
+
+class FakeRedisCacheClient(RedisCacheClient):
+    servers = {}
+
+    def __init__(self, servers, **options):
+        self._servers = servers
+        self._serializer = RedisSerializer()
+
+    def get_client(self, key=None, *, write=False):
+        server = self._servers[self._get_connection_pool_index(write)]
+        return self.servers.setdefault(server, FakeRedis())
+
+
+class FakeRedisCache(RedisCache):
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        self._class = FakeRedisCacheClient
+
+
+CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "blog.instrumentation.LocMemCache",
+        "LOCATION": "tests",
+    },
+    "file": {"BACKEND": "blog.instrumentation.FileBasedCache"},
+    "redis": {
+        "BACKEND": "fixtures.caches.FakeRedisCache",
+        "LOCATION": "redis://fake/0",
+    },
+}
+
+
+@pytest.fixture(params=list(CACHE_BACKENDS))
+def cache_backend(request, settings, tmp_path):
+    """Переключить кэш по умолчанию на locmem, файлы или FakeRedis."""
+    backend = {"KEY_PREFIX": "blogicum", **CACHE_BACKENDS[request.param]}
+    if request.param == "file":
+        backend["LOCATION"] = str(tmp_path / "cache")
+    settings.CACHES = {"default": backend}
+    FakeRedisCacheClient.servers.clear()
+    cache.clear()
+    cache_stats.clear()
+    yield request.param
+    cache_stats.clear()
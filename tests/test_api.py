@@ -0,0 +1,118 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.api import POST_DETAIL_FIELDS, POST_FIELDS
+from blog.models import Comment
+
+
+def get_json(client, url, **params):
+    response = client.get(url, params)
+    if response.streaming:
+        return response, json.loads(b"".join(response.streaming_content))
+    return response, response.json()
+
+
+def count_queries(client, url, **params):
+    get_json(client, url, **params)
+    with CaptureQueriesContext(connection) as queries:
+        response, _ = get_json(client, url, **params)
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.django_db
+def test_api_post_list_cursor_pagination(
+        client, mixer, user, published_category
+):
+    now = timezone.now()
+    posts = [
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            pub_date=now - timedelta(minutes=minutes)
+        )
+        for minutes in range(5)
+    ]
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False
+    )
+    seen, url, params = [], "/api/posts/", {"limit": 2}
+    while url:
+        response, data = get_json(client, url, **params)
+        assert response.status_code == 200
+        seen += [item["id"] for item in data["results"]]
+        url, params = data["next"], {}
+    assert seen == [post.pk for post in posts], (
+        "Убедитесь, что курсорная пагинация API обходит все опубликованные "
+        "публикации от новых к старым без пропусков и повторов."
+    )
+
+
+@pytest.mark.django_db
+def test_api_sparse_fieldsets(client, mixer, post_with_published_location):
+    post = post_with_published_location
+    _, data = get_json(client, "/api/posts/", fields="id,title")
+    assert data["results"] == [{"id": post.pk, "title": post.title}], (
+        "Убедитесь, что параметр `fields` ограничивает набор полей."
+    )
+    response, data = get_json(client, "/api/posts/", fields="id,password")
+    assert response.status_code == 400 and "password" in data["detail"]
+
+
+@pytest.mark.django_db
+def test_api_post_detail_and_visibility(
+        client, user_client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False
+    )
+    comment = mixer.blend(Comment, post=post)
+    assert client.get(f"/api/posts/{post.pk}/").status_code == 404, (
+        "Убедитесь, что API не отдаёт снятые с публикации записи."
+    )
+    response, data = get_json(user_client, f"/api/posts/{post.pk}/")
+    assert response.status_code == 200
+    assert [item["id"] for item in data["comments"]] == [comment.pk]
+
+    response, data = get_json(client, "/api/categories/")
+    assert [item["slug"] for item in data["results"]] == [
+        published_category.slug
+    ]
+
+
+@pytest.mark.django_db
+def test_api_query_count_does_not_grow_with_rows(
+        client, mixer, user, published_category, published_location
+):
+    def blend_posts(count):
+        posts = mixer.cycle(count).blend(
+            "blog.Post", author=user, category=published_category,
+            location=published_location
+        )
+        for post in posts:
+            mixer.cycle(2).blend(Comment, post=post)
+        return posts
+
+    post = blend_posts(1)[0]
+    urls = {
+        "/api/posts/": ",".join(POST_FIELDS),
+        f"/api/authors/{user.username}/posts/": ",".join(POST_FIELDS),
+        f"/api/posts/{post.pk}/": ",".join(POST_DETAIL_FIELDS),
+    }
+    before = {
+        url: count_queries(client, url, fields=fields)
+        for url, fields in urls.items()
+    }
+    blend_posts(9)
+    mixer.cycle(5).blend(Comment, post=post)
+    for url, fields in urls.items():
+        assert count_queries(client, url, fields=fields) == before[url], (
+            f"Убедитесь, что число запросов `{url}` не зависит от числа "
+            "публикаций и комментариев."
+        )
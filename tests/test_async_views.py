@@ -0,0 +1,96 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.test import AsyncClient, AsyncRequestFactory
+
+from blog import async_views
+from blog.instrumentation import histogram
+from blog.models import Comment
+
+
+def call(view, path, user=None, **kwargs):
+    request = AsyncRequestFactory().get(path)
+    request.user = user or AnonymousUser()
+    return async_to_sync(view)(request, **kwargs)
+
+
+@pytest.mark.django_db
+def test_async_views_match_sync_views(
+        client, mixer, user, published_category, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend(Comment, post=post)
+    mixer.cycle(12).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    cases = (
+        (async_views.index, "/", {}),
+        (async_views.index, "/?page=2", {}),
+        (
+            async_views.category_posts,
+            f"/category/{published_category.slug}/",
+            {"category_slug": published_category.slug},
+        ),
+        (
+            async_views.profile,
+            f"/profile/{user.username}/",
+            {"username": user.username},
+        ),
+        (async_views.post_detail, f"/posts/{post.pk}/", {"post_id": post.pk}),
+    )
+    for view, path, kwargs in cases:
+        expected = client.get(path)
+        response = call(view, path, **kwargs)
+        assert response.status_code == 200
+        assert response.content == expected.content, (
+            f"Убедитесь, что асинхронная версия `{path}` отдаёт ту же "
+            "страницу, что и синхронная."
+        )
+        assert response["ETag"] == expected["ETag"]
+
+
+@pytest.mark.django_db
+def test_async_views_hide_invisible_posts(
+        mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False
+    )
+    assert call(
+        async_views.index, "/"
+    ).content.decode().count(f"/posts/{post.pk}/") == 0
+    with pytest.raises(Http404):
+        call(async_views.post_detail, f"/posts/{post.pk}/", post_id=post.pk)
+    assert call(
+        async_views.post_detail, f"/posts/{post.pk}/", user=user,
+        post_id=post.pk
+    ).status_code == 200, (
+        "Убедитесь, что автор видит свою снятую с публикации запись."
+    )
+
+
+@pytest.mark.django_db
+def test_async_feed_is_cached_for_anonymous(
+        mixer, user, published_category, django_assert_num_queries
+):
+    mixer.blend("blog.Post", author=user, category=published_category)
+    first = call(async_views.index, "/")
+    with django_assert_num_queries(0):
+        cached = call(async_views.index, "/")
+    assert cached.content == first.content
+
+
+@pytest.mark.django_db
+def test_metrics_middleware_runs_under_asgi(post_with_published_location):
+    histogram.clear()
+    response = async_to_sync(AsyncClient().get)(
+        f"/posts/{post_with_published_location.pk}/"
+    )
+    assert response.status_code == 200
+    sample = histogram.snapshot()["blog:post_detail"]
+    assert sample["queries"]["p50"] >= 1, (
+        "Убедитесь, что метрики запросов собираются и при работе "
+        "через ASGI."
+    )
@@ -0,0 +1,92 @@
+import json
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from blog.dumps import DumpError, iter_json_array
+from blog.models import Category, Location, Post
+from blog.search import search_post_ids
+
+DB_JSON = Path(__file__).resolve().parent.parent / "blogicum" / "db.json"
+
+
+@pytest.fixture
+def reset_sequences():
+    yield
+    # Загруженные pk сдвигают счётчики SQLite, а тесты ниже по списку
+    # рассчитывают на нумерацию с начала; flush сбрасывает и её.
+    call_command("flush", interactive=False, verbosity=0)
+
+
+def test_json_array_is_parsed_incrementally():
+    objects = [{"pk": number, "text": "[{,}]" * number} for number in range(9)]
+    stream = StringIO(json.dumps(objects, indent=2))
+    assert list(iter_json_array(stream, chunk_size=7)) == objects, (
+        "Убедитесь, что объекты дампа разбираются верно, даже когда "
+        "граница куска приходится на середину объекта."
+    )
+    with pytest.raises(DumpError):
+        list(iter_json_array(StringIO('[{"pk": 1}, {"pk"'), chunk_size=4))
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("reset_sequences")
+def test_bulk_loaddata_loads_repository_dump():
+    output = StringIO()
+    call_command(
+        "bulk_loaddata", str(DB_JSON), batch_size=10,
+        exclude=["admin", "auth.permission", "sessions"], stdout=output
+    )
+    dump = json.loads(DB_JSON.read_text(encoding="utf-8"))
+    posts = [obj for obj in dump if obj["model"] == "blog.post"]
+    assert Post.objects.count() == len(posts)
+    assert Category.objects.count() == 6 and Location.objects.count() == 12
+    assert "в секунду" in output.getvalue(), (
+        "Убедитесь, что команда `bulk_loaddata` сообщает скорость загрузки."
+    )
+    assert Post.objects.filter(is_visible=True).exists(), (
+        "Убедитесь, что после загрузки обновляется видимость публикаций."
+    )
+    first = posts[0]
+    assert first["pk"] in search_post_ids(first["fields"]["title"]), (
+        "Убедитесь, что после загрузки перестраивается поисковый индекс."
+    )
+    constraints = connection.introspection.get_constraints(
+        connection.cursor(), Post._meta.db_table
+    )
+    assert "post_published_feed_idx" in constraints, (
+        "Убедитесь, что отложенные индексы создаются после загрузки."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("reset_sequences")
+def test_bulk_loaddata_resolves_natural_keys(tmp_path, django_user_model):
+    lines = [
+        {"model": "blog.category", "pk": 1, "fields": {
+            "title": "Категория", "slug": "cat", "description": "Описание",
+            "is_published": True, "created_at": "2024-01-01T00:00:00Z",
+        }},
+        {"model": "auth.user", "pk": 7, "fields": {
+            "username": "writer", "password": "!",
+        }},
+        {"model": "blog.post", "fields": {
+            "title": "Заметка", "text": "Текст",
+            "pub_date": "2024-01-02T00:00:00Z", "is_published": True,
+            "created_at": "2024-01-02T00:00:00Z",
+            "author": ["writer"], "category": 1, "location": None,
+        }},
+    ]
+    dump = tmp_path / "dump.jsonl"
+    dump.write_text(
+        "\n".join(json.dumps(line) for line in lines), encoding="utf-8"
+    )
+    call_command("bulk_loaddata", str(dump), batch_size=1, stdout=StringIO())
+    post = Post.objects.get()
+    assert post.author == django_user_model.objects.get(username="writer"), (
+        "Убедитесь, что натуральные ключи пользователей разрешаются в pk."
+    )
+    assert post.is_visible
@@ -0,0 +1,99 @@
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+from blog.cache import make_key
+from blog.instrumentation import cache_stats
+from blogicum.caches import get_caches
+
+
+def test_locmem_is_default():
+    default = get_caches(Path("/srv"), environ={})["default"]
+    assert default["BACKEND"] == "blog.instrumentation.LocMemCache"
+    assert (default["KEY_PREFIX"], default["VERSION"]) == ("blogicum", 1)
+
+
+def test_backend_from_environment():
+    default = get_caches(Path("/srv"), environ={
+        "BLOGICUM_CACHE_BACKEND": "redis",
+        "REDIS_URL": "redis://cache:6379/2",
+        "CACHE_VERSION": "3",
+    })["default"]
+    assert default["BACKEND"] == "blog.instrumentation.RedisCache"
+    assert default["LOCATION"] == "redis://cache:6379/2"
+    assert default["VERSION"] == 3
+    default = get_caches(Path("/srv"), environ={
+        "BLOGICUM_CACHE_BACKEND": "file",
+    })["default"]
+    assert default["LOCATION"] == "/srv/cache"
+    with pytest.raises(ImproperlyConfigured):
+        get_caches(
+            Path("/srv"), environ={"BLOGICUM_CACHE_BACKEND": "memcached"}
+        )
+
+
+def test_blog_keys_are_versioned(settings):
+    assert make_key("feed_page", 1, "index") == "blog:v1:feed_page:1:index"
+    settings.BLOG_CACHE_VERSION = 2
+    assert make_key("feed_page", 1, "index").startswith("blog:v2:"), (
+        "Убедитесь, что ключи данных блога содержат версию "
+        "BLOG_CACHE_VERSION."
+    )
+
+
+def test_backend_operations(cache_backend):
+    assert cache.get("blog:v1:test:a") is None
+    cache.set("blog:v1:test:a", {"value": 1})
+    cache.set_many({"blog:v1:test:b": 2, "blog:v1:test:c": "три"}, 60)
+    assert cache.get("blog:v1:test:a") == {"value": 1}
+    assert cache.get_many(["blog:v1:test:b", "blog:v1:test:c"]) == {
+        "blog:v1:test:b": 2, "blog:v1:test:c": "три"
+    }
+    cache.delete("blog:v1:test:a")
+    assert cache.get("blog:v1:test:a", "нет") == "нет"
+    assert cache_stats.snapshot()["test"] == {
+        "hits": 3, "misses": 2, "hit_ratio": 0.6
+    }, "Убедитесь, что попадания и промахи считаются по семействам ключей."
+    assert cache.incr("blog:v1:test:b", 3) == 5
+    assert cache.add("blog:v1:test:b", 0) is False
+
+
+@pytest.mark.django_db
+def test_feed_pages_and_cards_use_cache_backend(
+    cache_backend, client, user_client, user, post_with_published_location
+):
+    first = client.get("/")
+    assert client.get("/").content == first.content
+    first = client.get("/feed/")
+    assert client.get("/feed/").content == first.content
+
+    stats = cache_stats.snapshot()
+    assert stats["feed_page"]["hits"] == 2, (
+        "Убедитесь, что страницы лент и RSS берутся из кэша "
+        f"на бэкенде {cache_backend}."
+    )
+    assert stats["feed_generation"]["hits"] > 0
+    assert stats["post_card"]["misses"] == 1
+
+    user.is_staff = True
+    user.save()
+    assert user_client.get("/metrics/").json()["cache"] == (
+        cache_stats.snapshot()
+    ), "Убедитесь, что счётчики кэша видны на странице метрик."
+
+
+@pytest.mark.django_db
+def test_new_post_invalidates_cached_feed(
+    cache_backend, client, mixer, user, published_category
+):
+    client.get("/")
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Свежая публикация"
+    )
+    assert post.title in client.get("/").content.decode(), (
+        "Убедитесь, что новая публикация сбрасывает кэш лент "
+        f"на бэкенде {cache_backend}."
+    )
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Category, Post
+from blog.query_func import get_changed_since
+
+
+@pytest.mark.django_db
+def test_changed_since(mixer, user, published_category):
+    old, edited = mixer.cycle(2).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    since = timezone.now()
+    Post.objects.filter(pk__in=(old.pk, edited.pk)).update(
+        updated_at=since - timedelta(minutes=1)
+    )
+    edited.title = "Исправленный заголовок"
+    edited.save()
+
+    assert list(get_changed_since(Post.objects, since)) == [edited], (
+        "Убедитесь, что `get_changed_since` возвращает только записи, "
+        "изменённые после указанного момента."
+    )
+    assert list(get_changed_since(Post.objects)) == [old, edited]
+
+    published_category.save()
+    assert list(
+        get_changed_since(Category.objects.filter(is_published=True), since)
+    ) == [published_category]
+
+
+@pytest.mark.django_db
+def test_changed_since_cursor_keeps_equal_timestamps(
+    mixer, user, published_category
+):
+    posts = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    stamp = timezone.now()
+    Post.objects.update(updated_at=stamp)
+
+    assert list(get_changed_since(Post.objects, stamp)) == posts
+    assert list(
+        get_changed_since(Post.objects, stamp, after_pk=posts[0].pk)
+    ) == posts[1:], (
+        "Убедитесь, что курсор (updated_at, pk) не пропускает записи "
+        "с тем же временем изменения, что и последняя обработанная."
+    )
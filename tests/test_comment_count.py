@@ -0,0 +1,45 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+
+def get_comment_count(post):
+    return Post.objects.values_list("comment_count", flat=True).get(pk=post.pk)
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comment_writes(
+        mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Текст"})
+    mixer.cycle(2).blend(Comment, post=post)
+    assert get_comment_count(post) == 3, (
+        "Убедитесь, что при добавлении комментария увеличивается "
+        "сохранённый счётчик комментариев публикации."
+    )
+
+    Comment.objects.filter(post=post).first().delete()
+    assert get_comment_count(post) == 2, (
+        "Убедитесь, что при удалении комментария уменьшается "
+        "сохранённый счётчик комментариев публикации."
+    )
+
+    Comment.objects.filter(post=post).delete()
+    assert get_comment_count(post) == 0, (
+        "Убедитесь, что при массовом удалении комментариев сохранённый "
+        "счётчик комментариев публикации обнуляется."
+    )
+
+
+@pytest.mark.django_db
+def test_recount_comments_repairs_counters(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend(Comment, post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=42)
+    call_command("recount_comments", batch_size=1)
+    assert get_comment_count(post) == 3, (
+        "Убедитесь, что команда `recount_comments` восстанавливает "
+        "счётчики комментариев."
+    )
@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog.models import Comment
+
+
+def assert_not_modified(client, url, err_msg, **kwargs):
+    etag = client.get(url, **kwargs)["ETag"]
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag, **kwargs)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, err_msg
+    assert not response.content
+    return etag
+
+
+@pytest.mark.django_db
+def test_feeds_answer_not_modified(
+        client, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    urls = (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+    for url in urls:
+        for feed_client in (client, user_client):
+            assert_not_modified(
+                feed_client, url,
+                f"Убедитесь, что страница `{url}` отвечает 304, если с "
+                "прошлого запроса ничего не изменилось."
+            )
+
+    etags = {url: client.get(url)["ETag"] for url in urls}
+    Comment.objects.create(post=post, author=post.author, text="Новый")
+    for url, etag in etags.items():
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f"Убедитесь, что после нового комментария страница `{url}` "
+            "отдаётся заново."
+        )
+    assert client.get("/")["ETag"] != user_client.get("/")["ETag"]
+
+
+@pytest.mark.django_db
+def test_post_detail_not_modified_without_render(
+        client, post_with_published_location, django_assert_num_queries
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = client.get(url)["ETag"]
+    with django_assert_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что страница публикации отвечает 304 по ETag, не "
+        "загружая комментарии."
+    )
+
+
+@pytest.mark.django_db
+def test_hidden_post_is_not_validated(client, mixer, user):
+    post = mixer.blend("blog.Post", author=user, is_published=False)
+    response = client.get(f"/posts/{post.id}/", HTTP_IF_NONE_MATCH="*")
+    assert response.status_code == HTTPStatus.NOT_FOUND
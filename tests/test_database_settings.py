@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from blogicum.database import get_databases
+
+
+def test_sqlite_is_default():
+    database = get_databases(Path("/srv"), environ={})["default"]
+    assert database["ENGINE"] == "django.db.backends.sqlite3"
+    assert database["NAME"] == Path("/srv/db.sqlite3")
+
+
+def test_postgresql_from_environment():
+    database = get_databases(Path("/srv"), environ={
+        "BLOGICUM_DB_ENGINE": "postgresql",
+        "POSTGRES_DB": "blog",
+        "POSTGRES_HOST": "db",
+        "POSTGRES_CONN_MAX_AGE": "30",
+    })["default"]
+    assert database["ENGINE"] == "django.db.backends.postgresql"
+    assert (database["NAME"], database["HOST"]) == ("blog", "db")
+    assert database["CONN_MAX_AGE"] == 30 and database["CONN_HEALTH_CHECKS"]
+    assert not database["DISABLE_SERVER_SIDE_CURSORS"], (
+        "Убедитесь, что для PostgreSQL включены серверные курсоры."
+    )
+
+
+def test_pgbouncer_disables_server_side_state():
+    database = get_databases(Path("/srv"), environ={
+        "BLOGICUM_DB_ENGINE": "postgresql",
+        "POSTGRES_PGBOUNCER": "1",
+    })["default"]
+    assert database["DISABLE_SERVER_SIDE_CURSORS"]
+    assert database["OPTIONS"].get("prepare_threshold") is None
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ImproperlyConfigured):
+        get_databases(Path("/srv"), environ={"BLOGICUM_DB_ENGINE": "mysql"})
+
+
+def test_sqlite_path_from_environment():
+    database = get_databases(Path("/srv"), environ={
+        "BLOGICUM_DB_ENGINE": "auto",
+        "POSTGRES_HOST": "nowhere.invalid",
+        "SQLITE_PATH": "/tmp/bench.sqlite3",
+    })["default"]
+    assert database["NAME"] == "/tmp/bench.sqlite3", (
+        "Убедитесь, что путь к SQLite берётся из переданного окружения."
+    )
@@ -0,0 +1,184 @@
+import csv
+import json
+import tracemalloc
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.exports import iter_export
+from blog.models import Comment, Post
+
+
+def export_command(*args):
+    output = StringIO()
+    call_command("export_data", *args, stdout=output, stderr=StringIO())
+    return output.getvalue()
+
+
+@pytest.mark.django_db
+def test_export_includes_related_objects(
+    mixer, user, published_category, published_location
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location
+    )
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+
+    (row,) = map(json.loads, export_command("posts").splitlines())
+    assert row["id"] == post.pk and row["author"] == user.username
+    assert row["category"] == published_category.slug, (
+        "Убедитесь, что в выгрузку публикаций попадают автор, "
+        "категория и местоположение."
+    )
+    assert row["location"] == published_location.name
+
+    rows = list(csv.DictReader(StringIO(
+        export_command("comments", "--format", "csv", "--chunk-size", "1")
+    )))
+    assert [int(row["id"]) for row in rows] == [comment.pk]
+    assert rows[0]["post_id"] == str(post.pk)
+    assert rows[0]["author"] == user.username
+
+
+@pytest.mark.django_db
+def test_export_since(mixer, user, published_category):
+    old, edited = mixer.cycle(2).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    since = timezone.now()
+    Post.objects.update(updated_at=since - timedelta(days=1))
+    edited.save()
+    rows = export_command("posts", "--since", since.isoformat())
+    assert [json.loads(row)["id"] for row in rows.splitlines()] == [
+        edited.pk
+    ], "Убедитесь, что `--since` выгружает только изменённые записи."
+
+
+@pytest.mark.django_db
+def test_export_endpoint_is_staff_only(client, user_client, user, comment):
+    assert user_client.get("/export/comments/").status_code == 404
+    user.is_staff = True
+    user.save()
+    response = user_client.get("/export/comments/?format=csv")
+    assert response.status_code == 200 and response.streaming, (
+        "Убедитесь, что выгрузка для сотрудников отдаётся потоком."
+    )
+    rows = list(csv.reader(StringIO(
+        b"".join(response.streaming_content).decode()
+    )))
+    assert len(rows) == 2 and rows[0][0] == "id"
+    assert user_client.get("/export/comments/?since=вчера").status_code == 400
+    assert user_client.get("/export/users/").status_code == 400
+
+
+@pytest.mark.django_db
+def test_export_memory_does_not_grow_with_dataset(user, published_category):
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            title=f"Публикация {number}", text="Текст " * 400, pub_date=now,
+            author=user, category=published_category,
+        )
+        for number in range(3000)
+    )
+    Comment.objects.bulk_create(
+        Comment(post_id=post_id, author=user, text="Комментарий")
+        for post_id in Post.objects.values_list("pk", flat=True)
+    )
+    written = 0
+    tracemalloc.start()
+    try:
+        for line in iter_export("posts", chunk_size=100):
+            written += len(line)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert written > 7_000_000
+    assert peak < 3_000_000, (
+        "Убедитесь, что выгрузка читает записи порциями и не держит "
+        f"их все в памяти: пик {peak} байт на {written} байт выгрузки."
+    )
+
+
+@pytest.mark.django_db
+def test_export_cursor_resumes_after_equal_timestamps(
+    mixer, user, published_category
+):
+    posts = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    stamp = timezone.now()
+    Post.objects.update(updated_at=stamp)
+    rows = [
+        json.loads(row)
+        for row in export_command("posts", "--chunk-size", "1").splitlines()
+    ]
+    assert [row["id"] for row in rows] == [post.pk for post in posts]
+
+    rows = export_command(
+        "posts", "--since", rows[0]["updated_at"],
+        "--after-id", str(rows[0]["id"])
+    )
+    assert [json.loads(row)["id"] for row in rows.splitlines()] == [
+        post.pk for post in posts[1:]
+    ], (
+        "Убедитесь, что продолжение выгрузки с курсора (updated_at, id) "
+        "не теряет записи с тем же временем изменения."
+    )
+
+
+@pytest.mark.django_db
+def test_export_since_sees_comments_and_renames(
+    mixer, user, published_category, published_location
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location
+    )
+    Post.objects.update(updated_at=timezone.now() - timedelta(days=1))
+
+    def changed_since(since):
+        rows = export_command("posts", "--since", since.isoformat())
+        return [json.loads(row) for row in rows.splitlines()]
+
+    since = timezone.now()
+    mixer.blend("blog.Comment", post=post, author=user)
+    assert [row["comment_count"] for row in changed_since(since)] == [1], (
+        "Убедитесь, что новый комментарий попадает в инкрементальную "
+        "выгрузку публикации."
+    )
+    for obj, field, column in (
+        (published_category, "title", "category_title"),
+        (published_location, "name", "location"),
+    ):
+        since = timezone.now()
+        setattr(obj, field, "Новое")
+        obj.save()
+        assert [row[column] for row in changed_since(since)] == ["Новое"], (
+            "Убедитесь, что переименование категории или местоположения "
+            "попадает в инкрементальную выгрузку публикаций."
+        )
+
+
+@pytest.mark.django_db
+def test_unexported_category_changes_keep_updated_at(
+    mixer, user, published_category, published_location
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location
+    )
+    stamp = timezone.now() - timedelta(days=1)
+    Post.objects.update(updated_at=stamp)
+    published_category.description = "Новое описание"
+    published_category.save()
+    published_location.save()
+    post.refresh_from_db()
+    assert post.updated_at == stamp, (
+        "Убедитесь, что updated_at публикаций сдвигается, только когда "
+        "меняются выгружаемые поля категории или местоположения."
+    )
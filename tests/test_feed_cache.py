@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.cache import get_feed_timeout
+
+CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "feed-cache-tests",
+    },
+    "filebased": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": None,
+    },
+}
+
+
+@pytest.fixture(params=CACHE_BACKENDS)
+def feed_cache(request, tmp_path):
+    backend = dict(CACHE_BACKENDS[request.param])
+    if backend["LOCATION"] is None:
+        backend["LOCATION"] = str(tmp_path / "cache")
+    with override_settings(CACHES={"default": backend}):
+        cache.clear()
+        yield cache
+
+
+@pytest.mark.django_db
+def test_feed_pages_are_cached_for_anonymous(
+        feed_cache, client, user_client, mixer, user, published_category,
+        django_assert_num_queries
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category
+    )
+    for url in ("/", f"/category/{published_category.slug}/"):
+        first = client.get(url)
+        assert post.title in first.content.decode()
+        with django_assert_num_queries(0):
+            cached = client.get(url)
+        assert cached.content == first.content, (
+            f"Убедитесь, что страница `{url}` для анонимного пользователя "
+            "отдаётся из кэша без обращений к базе данных."
+        )
+        assert user_client.get(url).context is not None, (
+            f"Убедитесь, что страница `{url}` не кэшируется для "
+            "авторизованного пользователя."
+        )
+
+
+@pytest.mark.django_db
+def test_feed_cache_invalidated_on_changes(
+        feed_cache, client, mixer, user, published_category
+):
+    client.get("/")
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category
+    )
+    assert post.title in client.get("/").content.decode(), (
+        "Убедитесь, что кэш ленты сбрасывается при сохранении публикации."
+    )
+    published_category.is_published = False
+    published_category.save()
+    assert post.title not in client.get("/").content.decode(), (
+        "Убедитесь, что кэш ленты сбрасывается при изменении категории."
+    )
+
+
+@pytest.mark.django_db
+@override_settings(FEED_CACHE_TIMEOUT=600)
+def test_feed_timeout_stops_at_next_pub_date(mixer, user):
+    assert get_feed_timeout() == 600
+    mixer.blend(
+        "blog.Post", author=user,
+        pub_date=timezone.now() + timedelta(seconds=30)
+    )
+    assert 0 < get_feed_timeout() <= 30, (
+        "Убедитесь, что страница ленты хранится в кэше не дольше, чем до "
+        "ближайшей отложенной публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_unresolved_pages_are_not_cached(
+        client, settings, mixer, user, published_category
+):
+    settings.CACHES = {"default": CACHE_BACKENDS["locmem"]}
+    cache.clear()
+    mixer.blend("blog.Post", author=user, category=published_category)
+    for url in ("/?page=abc", "/?page=01", "/?page=999"):
+        assert client.get(url).status_code == 200
+    assert not [key for key in cache._cache if "feed_page" in key]
+    client.get("/?page=1")
+    assert len([key for key in cache._cache if "feed_page" in key]) == 1
+    cache.clear()
+    settings.PAGINATION_MODE = "cursor"
+    forged = "bnwyMDIwLTAxLTAxVDAwOjAwOjAwKzAwOjAwfDk5OTk"
+    for url in ("/?cursor=junk", f"/?cursor={forged}"):
+        assert client.get(url).status_code == 200
+    assert not [key for key in cache._cache if "feed_page" in key], (
+        "Убедитесь, что страницы лент с неразобранными или несуществующими "
+        "номерами и курсорами не попадают в кэш."
+    )
+    client.get("/feed/")
+    client.get("/feed/?page=7")
+    assert len([key for key in cache._cache if "feed_page" in key]) == 1, (
+        "Убедитесь, что параметры страницы не входят в ключ RSS-ленты."
+    )
@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+
+@pytest.fixture
+def feed_urls(user, published_category):
+    return (
+        "/feed/",
+        "/feed/atom/",
+        f"/category/{published_category.slug}/feed/",
+        f"/category/{published_category.slug}/feed/atom/",
+        f"/profile/{user.username}/feed/",
+        f"/profile/{user.username}/feed/atom/",
+    )
+
+
+@pytest.mark.django_db
+def test_feeds_list_only_visible_posts(
+        client, mixer, user, published_category, feed_urls
+):
+    visible = mixer.blend(
+        "blog.Post", author=user, category=published_category
+    )
+    hidden = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False
+    )
+    delayed = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(days=1)
+    )
+    for url in feed_urls:
+        response = client.get(url)
+        assert response.status_code == 200
+        content = response.content.decode()
+        assert f"/posts/{visible.pk}/" in content, (
+            f"Убедитесь, что лента `{url}` содержит опубликованные записи."
+        )
+        for post in (hidden, delayed):
+            assert f"/posts/{post.pk}/" not in content, (
+                f"Убедитесь, что лента `{url}` не содержит снятых с "
+                "публикации и отложенных записей."
+            )
+
+
+@pytest.mark.django_db
+def test_feeds_unknown_objects_return_404(client, mixer):
+    category = mixer.blend("blog.Category", is_published=False)
+    for url in (
+        f"/category/{category.slug}/feed/",
+        "/profile/nobody/feed/atom/",
+    ):
+        assert client.get(url).status_code == 404
+
+
+@pytest.mark.django_db
+def test_feeds_are_cached_and_support_conditional_get(
+        client, mixer, user, published_category, feed_urls,
+        django_assert_num_queries
+):
+    mixer.blend("blog.Post", author=user, category=published_category)
+    for url in feed_urls:
+        first = client.get(url)
+        with django_assert_num_queries(0):
+            cached = client.get(url)
+            not_modified = client.get(
+                url, HTTP_IF_NONE_MATCH=first["ETag"]
+            )
+        assert cached.content == first.content, (
+            f"Убедитесь, что лента `{url}` отдаётся из кэша без обращений "
+            "к базе данных."
+        )
+        assert not_modified.status_code == 304, (
+            f"Убедитесь, что лента `{url}` поддерживает условные запросы."
+        )
+
+    post = mixer.blend("blog.Post", author=user, category=published_category)
+    assert f"/posts/{post.pk}/" in client.get("/feed/").content.decode(), (
+        "Убедитесь, что кэш лент сбрасывается при сохранении публикации."
+    )
@@ -0,0 +1,171 @@
+from datetime import timedelta
+from io import BytesIO
+from unittest.mock import Mock
+
+import pytest
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from blog import tasks
+from blog.images import get_variant_name
+from blog.models import ImageJob, Post
+
+
+def make_upload(size=(1600, 900)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color=(20, 120, 200)).save(buffer, "JPEG")
+    return SimpleUploadedFile(
+        "big_image.jpg", buffer.getvalue(), content_type="image/jpeg"
+    )
+
+
+def assert_variants_exist(post, card_width):
+    storage = post.image.storage
+    for variant in ("card", "detail"):
+        for extension in (None, "webp"):
+            name = get_variant_name(post.image.name, variant, extension)
+            assert storage.exists(name), (
+                f"Убедитесь, что для фото публикации создаётся копия `{name}`."
+            )
+    with storage.open(get_variant_name(post.image.name, "card")) as card:
+        assert Image.open(card).width == card_width, (
+            "Убедитесь, что копия фото для карточки уменьшается до 640px "
+            "и не растягивается, если оригинал меньше."
+        )
+
+
+def create_post_with_image(client, category, location):
+    client.post("/posts/create/", data={
+        "title": "С картинкой",
+        "text": "Текст",
+        "pub_date": timezone.now().strftime("%Y-%m-%dT%H:%M"),
+        "category": category.id,
+        "location": location.id,
+        "image": make_upload(),
+    })
+    return Post.objects.get(title="С картинкой")
+
+
+@pytest.mark.django_db
+@override_settings(IMAGE_WORKER_MODE="sync")
+def test_variants_generated_after_upload(
+        user_client, published_category, published_location,
+        django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks() as callbacks:
+        post = create_post_with_image(
+            user_client, published_category, published_location
+        )
+    assert not post.image_variants, (
+        "Убедитесь, что копии фото строятся не внутри запроса создания "
+        "публикации, а отдельной задачей."
+    )
+    job = ImageJob.objects.get(post=post)
+    assert job.status == ImageJob.PENDING
+    assert post.image.url in user_client.get("/").content.decode(), (
+        "Убедитесь, что пока копии не готовы, карточка показывает оригинал."
+    )
+
+    for callback in callbacks:
+        callback()
+    post.refresh_from_db()
+    job.refresh_from_db()
+    assert job.status == ImageJob.DONE and job.attempts == 1
+    assert post.image_variants == ["card", "detail"]
+    assert_variants_exist(post, card_width=640)
+
+    content = user_client.get("/").content.decode()
+    assert post.image_webp_srcset in content, (
+        "Убедитесь, что карточка публикации использует `srcset` с "
+        "уменьшенными копиями фото."
+    )
+
+
+@pytest.mark.django_db
+def test_backfill_command(post_with_published_location):
+    post = post_with_published_location
+    assert not post.image_variants
+    call_command("generate_image_variants", workers=2)
+    post.refresh_from_db()
+    assert post.image_variants, (
+        "Убедитесь, что команда `generate_image_variants` строит копии фото "
+        "для уже загруженных публикаций."
+    )
+    assert_variants_exist(post, card_width=100)
+
+
+@pytest.mark.django_db
+@override_settings(
+    IMAGE_WORKER_MODE="sync", IMAGE_JOB_MAX_ATTEMPTS=3,
+    IMAGE_JOB_RETRY_DELAY=0
+)
+def test_image_job_retries(monkeypatch, post_with_published_location):
+    results = iter((False, True))
+    monkeypatch.setattr(
+        tasks, "process_post_image", lambda post: next(results)
+    )
+    job = ImageJob.objects.create(post=post_with_published_location)
+    tasks.run_image_job(job.pk)
+    job.refresh_from_db()
+    assert job.status == ImageJob.DONE and job.attempts == 2, (
+        "Убедитесь, что неудачная обработка фото повторяется."
+    )
+
+    monkeypatch.setattr(tasks, "process_post_image", lambda post: False)
+    failed = ImageJob.objects.create(post=post_with_published_location)
+    call_command("process_image_jobs")
+    failed.refresh_from_db()
+    assert failed.status == ImageJob.FAILED and failed.attempts == 3, (
+        "Убедитесь, что после исчерпания попыток задача помечается "
+        "как неудачная."
+    )
+    assert failed.last_error
+
+
+@pytest.mark.django_db
+@override_settings(IMAGE_JOB_TIMEOUT=60)
+def test_stale_running_job_is_reclaimed(
+    monkeypatch, post_with_published_location
+):
+    monkeypatch.setattr(tasks, "process_post_image", lambda post: True)
+    job = ImageJob.objects.create(
+        post=post_with_published_location, status=ImageJob.RUNNING,
+        attempts=1
+    )
+    assert tasks.run_pending_image_jobs() == 0, (
+        "Убедитесь, что задачу, которая выполняется прямо сейчас, "
+        "не берёт второй обработчик."
+    )
+    ImageJob.objects.filter(pk=job.pk).update(
+        updated_at=timezone.now() - timedelta(minutes=5)
+    )
+    assert tasks.run_pending_image_jobs() == 1
+    job.refresh_from_db()
+    assert job.status == ImageJob.DONE, (
+        "Убедитесь, что задача, брошенная упавшим процессом, "
+        "снова берётся в работу."
+    )
+
+
+@pytest.mark.django_db
+@override_settings(IMAGE_JOB_RETRY_DELAY=60)
+def test_worker_reschedules_instead_of_sleeping(
+    monkeypatch, post_with_published_location
+):
+    monkeypatch.setattr(tasks, "process_post_image", lambda post: False)
+    monkeypatch.setattr(tasks.time, "sleep", pytest.fail)
+    monkeypatch.setattr(tasks, "close_old_connections", lambda: None)
+    scheduled = []
+    monkeypatch.setattr(
+        tasks.threading, "Timer",
+        lambda delay, function: scheduled.append(delay) or Mock()
+    )
+    job = ImageJob.objects.create(post=post_with_published_location)
+    tasks.run_in_worker(job.pk)
+    assert scheduled == [60], (
+        "Убедитесь, что повтор задачи откладывается таймером, "
+        "а не паузой в потоке пула."
+    )
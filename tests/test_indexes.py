@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+
+from blog.models import Comment
+from blog.query_func import get_optimized_queryset
+
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="План запроса проверяется через EXPLAIN QUERY PLAN SQLite.",
+    ),
+]
+
+
+def assert_uses_index(queryset, index_name, err_msg):
+    plan = queryset.explain()
+    assert index_name in plan, f"{err_msg}\nПлан запроса:\n{plan}"
+
+
+def test_index_feed_uses_index(published_category):
+    plan = get_optimized_queryset(filters=True).explain()
+    assert "_feed_idx" in plan, (
+        "Убедитесь, что лента главной страницы использует составной индекс "
+        f"по публикациям.\nПлан запроса:\n{plan}"
+    )
+
+
+def test_category_feed_uses_index(published_category):
+    assert_uses_index(
+        get_optimized_queryset(
+            manager=published_category.posts, filters=True
+        ),
+        "post_category_feed_idx",
+        "Убедитесь, что лента категории использует индекс "
+        "`post_category_feed_idx`.",
+    )
+
+
+def test_profile_feed_uses_index(user):
+    assert_uses_index(
+        get_optimized_queryset(
+            manager=user.posts, filters=False
+        ),
+        "post_author_feed_idx",
+        "Убедитесь, что лента профиля использует индекс "
+        "`post_author_feed_idx`.",
+    )
+
+
+def test_post_comments_use_index(post_with_published_location):
+    assert_uses_index(
+        Comment.objects.filter(post=post_with_published_location),
+        "comment_post_created_idx",
+        "Убедитесь, что комментарии к публикации выбираются по индексу "
+        "`comment_post_created_idx`.",
+    )
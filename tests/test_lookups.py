@@ -0,0 +1,90 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import lookups
+from blog.lookups import get_lookup_tables
+from blog.query_func import get_optimized_queryset
+
+
+@pytest.mark.django_db
+def test_feed_takes_category_and_location_from_memory(
+    post_with_published_location, published_category, published_location
+):
+    get_lookup_tables()
+    queryset = get_optimized_queryset()
+    with CaptureQueriesContext(connection) as queries:
+        (post,) = queryset
+        assert post.category.title == published_category.title
+        assert post.location.name == published_location.name
+    assert len(queries) == 1, (
+        "Убедитесь, что категория и местоположение публикаций ленты "
+        "берутся из справочников в памяти, а не отдельными запросами."
+    )
+    sql = queries[0]["sql"]
+    assert '"blog_category"."title"' not in sql, (
+        "Убедитесь, что запрос ленты не выбирает столбцы категорий."
+    )
+    assert "blog_location" not in sql, (
+        "Убедитесь, что запрос ленты не соединяется с таблицей "
+        "местоположений."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_visibility_does_not_depend_on_lookups(
+    post_with_published_location, published_category
+):
+    get_lookup_tables()
+    # Как изменение из другого процесса: без сигналов и сброса справочников.
+    type(published_category).objects.filter(pk=published_category.pk).update(
+        is_published=False
+    )
+    assert not list(get_optimized_queryset()), (
+        "Убедитесь, что опубликованность категории проверяется в запросе "
+        "ленты, а не по справочнику в памяти процесса."
+    )
+
+
+@pytest.mark.django_db
+def test_lookups_are_invalidated_on_save(
+    client, post_with_published_location, published_category,
+    published_location
+):
+    get_lookup_tables()
+    published_location.name = "Новое место"
+    published_location.save()
+    assert "Новое место" in client.get("/").content.decode(), (
+        "Убедитесь, что справочник местоположений обновляется "
+        "при их изменении."
+    )
+
+
+@pytest.mark.django_db
+def test_other_processes_see_lookup_changes(
+    cache_backend, post_with_published_location, published_location
+):
+    get_lookup_tables()
+    # Другой процесс: свои справочники, но общий кэш.
+    stale = lookups._tables
+    published_location.name = "Новое место"
+    published_location.save()
+    lookups._tables = stale
+    (post,) = get_optimized_queryset()
+    assert post.location.name == "Новое место", (
+        "Убедитесь, что изменение местоположения в одном процессе "
+        "сбрасывает справочники остальных через общий кэш."
+    )
+
+
+@pytest.mark.django_db
+def test_page_rows_do_not_load_lookups(post_with_published_location):
+    queryset = get_optimized_queryset().select_related(None).only(
+        "pub_date", "updated_at"
+    )
+    with CaptureQueriesContext(connection) as queries:
+        list(queryset)
+    assert len(queries) == 1, (
+        "Убедитесь, что запросы без category_id и location_id "
+        "не загружают справочники."
+    )
@@ -0,0 +1,58 @@
+import logging
+
+import pytest
+from django.test import override_settings
+
+from blog.instrumentation import histogram
+
+
+@pytest.fixture(autouse=True)
+def clean_histogram():
+    histogram.clear()
+    yield
+    histogram.clear()
+
+
+@pytest.mark.django_db
+def test_request_metrics_recorded(client, post_with_published_location):
+    response = client.get(f"/posts/{post_with_published_location.id}/")
+    stats = histogram.snapshot().get("blog:post_detail")
+    assert stats and stats["count"] == 1, (
+        "Убедитесь, что метрики запроса записываются под именем "
+        "представления `blog:post_detail`."
+    )
+    assert stats["queries"]["p50"] == 2
+    assert stats["render_time"]["p50"] > 0
+    assert stats["size"]["p50"] == len(response.content)
+
+
+@pytest.mark.django_db
+@override_settings(VIEW_QUERY_BUDGETS={"blog:index": 0})
+def test_query_budget_warning(client, caplog):
+    with caplog.at_level(logging.WARNING, logger="blog.metrics"):
+        client.get("/")
+    assert any(
+        "blog:index" in record.getMessage() for record in caplog.records
+    ), "Убедитесь, что при превышении бюджета запросов пишется предупреждение."
+
+
+@pytest.mark.django_db
+def test_request_log_only_when_info_enabled(client, caplog):
+    with caplog.at_level(logging.WARNING, logger="blog.metrics"):
+        client.get("/")
+    assert not caplog.records
+    with caplog.at_level(logging.INFO, logger="blog.metrics"):
+        client.get("/")
+    assert any(
+        '"view": "blog:index"' in record.getMessage()
+        for record in caplog.records
+    ), "Убедитесь, что при уровне INFO метрики запроса пишутся в лог."
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_is_staff_only(client, user_client, user):
+    client.get("/")
+    assert user_client.get("/metrics/").status_code == 404
+    user.is_staff = True
+    user.save()
+    assert "blog:index" in user_client.get("/metrics/").json()
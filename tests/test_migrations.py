@@ -0,0 +1,32 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.recorder import MigrationRecorder
+
+
+@pytest.mark.django_db
+def test_models_match_migrations():
+    output = StringIO()
+    try:
+        call_command(
+            "makemigrations", "blog", check=True, dry_run=True,
+            stdout=output
+        )
+    except SystemExit:
+        pytest.fail(
+            "Убедитесь, что все изменения моделей `blog` отражены в "
+            f"миграциях:\n{output.getvalue()}"
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_blog_migrations_apply_and_revert(post_with_published_location):
+    call_command("migrate", "blog", "zero", verbosity=0)
+    assert "blog_post" not in connection.introspection.table_names()
+    call_command("migrate", "blog", verbosity=0)
+    applied = MigrationRecorder(connection).applied_migrations()
+    assert ("blog", "0016_post_search_index") in applied, (
+        f"Убедитесь, что миграции `blog` применяются на {connection.vendor}."
+    )
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+from blog.paginate import CursorPage, decode_cursor
+
+N_POSTS = N_PER_PAGE * 2 + 5
+
+
+@pytest.fixture
+def many_posts(mixer, user, published_category):
+    # Половина публикаций с одинаковой датой: курсор обязан различать их по id.
+    same_date = timezone.now() - timedelta(days=1)
+    pub_dates = (
+        same_date if i % 2 else same_date - timedelta(minutes=i)
+        for i in range(N_POSTS)
+    )
+    return mixer.cycle(N_POSTS).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=pub_dates,
+    )
+
+
+def walk_pages(client, url, cursor_key):
+    pages = []
+    response = client.get(url)
+    while True:
+        page_obj = response.context["page_obj"]
+        pages.append(page_obj)
+        cursor = getattr(page_obj, cursor_key)
+        if cursor is None:
+            return pages
+        response = client.get(url, {"cursor": cursor})
+
+
+@pytest.mark.django_db
+@override_settings(PAGINATION_MODE="cursor")
+def test_cursor_pagination_walks_feed(client, many_posts, published_category):
+    for url in (
+        "/",
+        f"/category/{published_category.slug}/",
+        f"/profile/{many_posts[0].author.username}/",
+    ):
+        pages = walk_pages(client, url, "next_cursor")
+        assert all(isinstance(page, CursorPage) for page in pages), (
+            f"Убедитесь, что на странице `{url}` в режиме `cursor` "
+            "используется курсорная пагинация."
+        )
+        seen = [post.id for page in pages for post in page]
+        assert len(pages) == 3 and len(seen) == len(set(seen)) == N_POSTS, (
+            f"Убедитесь, что курсорная пагинация на странице `{url}` "
+            "проходит по всем публикациям ровно один раз."
+        )
+        ordered = sorted(
+            many_posts, key=lambda post: (post.pub_date, post.id),
+            reverse=True
+        )
+        assert seen == [post.id for post in ordered], (
+            f"Убедитесь, что курсорная пагинация на странице `{url}` "
+            "сохраняет порядок по убыванию даты публикации."
+        )
+
+        back = client.get(url, {"cursor": pages[-1].previous_cursor})
+        assert [post.id for post in back.context["page_obj"]] == [
+            post.id for post in pages[-2]
+        ], (
+            f"Убедитесь, что ссылка на предыдущую страницу `{url}` "
+            "возвращает предыдущую страницу ленты."
+        )
+
+
+@pytest.mark.django_db
+@override_settings(PAGINATION_MODE="cursor")
+def test_cursor_pagination_ignores_broken_cursor(client, many_posts):
+    response = client.get("/", {"cursor": "not-a-cursor"})
+    page_obj = response.context["page_obj"]
+    assert len(page_obj) == N_PER_PAGE and not page_obj.has_previous(), (
+        "Убедитесь, что при некорректном курсоре отображается первая "
+        "страница ленты."
+    )
+    assert decode_cursor(page_obj.next_cursor)[0] == "n"
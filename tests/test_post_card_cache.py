@@ -0,0 +1,48 @@
+import pytest
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+
+from blog.models import Post
+
+
+def card_key(post):
+    post = Post.objects.select_related("author").get(pk=post.pk)
+    return make_template_fragment_key(
+        "post_card", [post.pk, post.card_version]
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_is_cached(user_client, post_with_published_location):
+    user_client.get("/")
+    assert cache.get(card_key(post_with_published_location)), (
+        "Убедитесь, что карточка публикации кэшируется "
+        "с ключом из id публикации и её версии."
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_version_follows_inputs(
+    mixer, user, user_client, post_with_published_location,
+    published_category, published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+
+    mixer.blend("blog.Comment", post=post, author=user)
+    assert "Комментарии (1)" in user_client.get("/").content.decode(), (
+        "Убедитесь, что карточка обновляется при новом комментарии."
+    )
+
+    published_category.title = "Новая категория"
+    published_category.save()
+    published_location.name = "Новое место"
+    published_location.save()
+    user.username = "renamed"
+    user.save()
+    content = user_client.get("/").content.decode()
+    for value in ("Новая категория", "Новое место", "@renamed"):
+        assert value in content, (
+            "Убедитесь, что версия карточки меняется при изменении "
+            "категории, местоположения и имени автора."
+        )
@@ -0,0 +1,20 @@
+import pytest
+
+from blog.models import Comment
+
+
+@pytest.mark.django_db
+def test_post_detail_queries_for_anonymous(
+        client, mixer, post_with_published_location,
+        django_assert_max_num_queries
+):
+    post = post_with_published_location
+    mixer.cycle(5).blend(Comment, post=post)
+    with django_assert_max_num_queries(2):
+        response = client.get(f"/posts/{post.id}/")
+        content = response.content.decode()
+    assert response.status_code == 200
+    assert content.count('name="comment_') == 5, (
+        "Убедитесь, что на странице публикации отображаются все "
+        "комментарии к ней."
+    )
@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from blog import scheduler
+from blog.models import Post
+from blog.query_func import get_optimized_queryset
+
+
+@pytest.mark.django_db
+def test_scheduled_post_becomes_visible(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(hours=1)
+    )
+    assert not post.is_visible
+    assert not get_optimized_queryset().filter(pk=post.pk).exists()
+
+    changed = scheduler.publish_due_posts(
+        now=timezone.now() + timedelta(hours=2)
+    )
+    assert changed == 1
+    assert get_optimized_queryset().filter(pk=post.pk).exists(), (
+        "Убедитесь, что планировщик показывает в лентах отложенную "
+        "публикацию, время которой пришло."
+    )
+
+
+@pytest.mark.django_db
+def test_scheduler_hides_unpublished_posts(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category
+    )
+    assert post.is_visible
+    Post.objects.filter(pk=post.pk).update(is_published=False)
+    call_command("publish_scheduled")
+    post.refresh_from_db()
+    assert not post.is_visible, (
+        "Убедитесь, что планировщик скрывает публикации, снятые с "
+        "публикации в обход `save()`."
+    )
+
+
+@pytest.mark.django_db
+@override_settings(PUBLICATION_MAX_LAG=60)
+def test_publication_lag_is_bounded(monkeypatch):
+    calls = []
+    monkeypatch.setattr(scheduler, "publish_due_posts", lambda: calls.append(1))
+    now = [1000.0]
+    monkeypatch.setattr(scheduler.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(scheduler, "_last_run", float("-inf"))
+
+    for moment in (1000.0, 1010.0, 1061.0):
+        now[0] = moment
+        scheduler.ensure_publication_lag()
+    assert len(calls) == 2, (
+        "Убедитесь, что планировщик запускается из лент не чаще, чем раз в "
+        "`PUBLICATION_MAX_LAG` секунд, и не реже."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_request_does_not_write_without_due_posts(
+        client, mixer, user, published_category, django_assert_num_queries
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category
+    )
+    Post.objects.filter(pk=post.pk).update(is_published=False)
+    with django_assert_num_queries(1) as queries:
+        assert scheduler.publish_due_posts() == 0
+    assert queries.captured_queries[0]["sql"].startswith("SELECT"), (
+        "Убедитесь, что планировщик в запросах лент только читает, "
+        "когда показывать нечего."
+    )
+    post.refresh_from_db()
+    assert post.is_visible
+    assert scheduler.hide_unpublished_posts() == 1
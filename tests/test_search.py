@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+from blog.search import search_post_ids
+
+
+@pytest.mark.django_db
+def test_search_uses_russian_stemming_and_ranking(
+        mixer, user, published_category
+):
+    in_text = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Заметки", text="Сегодня гуляли с котиками по набережной."
+    )
+    in_title = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Про котика", text="Короткая заметка."
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Про собак", text="Без кошек."
+    )
+    assert search_post_ids("котик") == [in_title.pk, in_text.pk], (
+        "Убедитесь, что поиск находит словоформы запроса и ставит выше "
+        "публикации, где слово встречается в заголовке."
+    )
+
+
+@pytest.mark.django_db
+def test_search_index_follows_post_changes(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Прогулка", text="Текст"
+    )
+    post.title = "Путешествие"
+    post.save()
+    assert search_post_ids("прогулка") == []
+    assert search_post_ids("путешествия") == [post.pk], (
+        "Убедитесь, что поисковый индекс обновляется при сохранении "
+        "публикации."
+    )
+    post.delete()
+    assert search_post_ids("путешествие") == [], (
+        "Убедитесь, что публикация удаляется из поискового индекса."
+    )
+
+
+@pytest.mark.django_db
+def test_search_view_hides_invisible_posts(
+        client, mixer, user, published_category
+):
+    visible = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Видимая", text="Рассказ о <b>горах</b> и реках."
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, title="Снятая", text="Тоже о горах."
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+        title="Отложенная", text="И снова горы."
+    )
+    response = client.get("/search/", {"q": "гора"})
+    posts = list(response.context["page_obj"])
+    assert posts == [Post.objects.get(pk=visible.pk)], (
+        "Убедитесь, что поиск показывает только опубликованные публикации "
+        "с наступившей датой публикации."
+    )
+    content = response.content.decode()
+    assert "<mark>горах</mark>" in content, (
+        "Убедитесь, что совпадения во фрагменте текста подсвечиваются."
+    )
+    assert "&lt;b&gt;" in content, (
+        "Убедитесь, что текст публикации во фрагменте экранируется."
+    )
+
+
+@pytest.mark.django_db
+def test_rebuild_search_index(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Озеро", text="Текст"
+    )
+    Post.objects.filter(pk=post.pk).update(title="Море")
+    call_command("rebuild_search_index", batch_size=1)
+    assert search_post_ids("море") == [post.pk], (
+        "Убедитесь, что команда `rebuild_search_index` переиндексирует "
+        "публикации, изменённые в обход сигналов."
+    )
+
+
+@pytest.mark.django_db
+def test_search_limit_applies_after_visibility(
+        client, settings, mixer, user, published_category
+):
+    settings.SEARCH_MAX_RESULTS = 1
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, title="Про реку", text="Река."
+    )
+    visible = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Заметки", text="Вдоль реки."
+    )
+    response = client.get("/search/", {"q": "река"})
+    assert [post.pk for post in response.context["page_obj"]] == [
+        visible.pk
+    ], (
+        "Убедитесь, что скрытые публикации отсеиваются до ограничения "
+        "числа результатов поиска."
+    )
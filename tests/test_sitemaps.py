@@ -0,0 +1,112 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+
+@pytest.fixture(autouse=True)
+def sitemap_settings(settings, tmp_path):
+    settings.SITEMAP_ROOT = tmp_path / "sitemaps"
+    settings.SITEMAP_CHUNK_SIZE = 2
+    return settings
+
+
+def read(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return b"".join(response.streaming_content).decode()
+
+
+def get_locations(content):
+    return re.findall(r"<loc>http://testserver(.+?)</loc>", content)
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    return mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category
+    )
+
+
+@pytest.mark.django_db
+def test_sitemap_is_split_into_chunks(
+        client, mixer, user, published_category, posts
+):
+    hidden = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(days=1)
+    )
+    sections = get_locations(read(client, "/sitemap.xml"))
+    assert (
+        f"/sitemap-categories-{published_category.pk // 2}.xml" in sections
+    )
+    assert any("-profiles-" in url for url in sections)
+    post_sections = [url for url in sections if "-posts-" in url]
+    assert len(post_sections) > 1, (
+        "Убедитесь, что карта сайта делится на файлы по диапазонам id."
+    )
+    urls = []
+    for section in post_sections:
+        content = read(client, section)
+        assert "<lastmod>" in content
+        urls += get_locations(content)
+    assert sorted(urls) == sorted(f"/posts/{post.pk}/" for post in posts), (
+        "Убедитесь, что карта сайта содержит каждую видимую публикацию "
+        "ровно один раз и не содержит отложенных."
+    )
+    assert f"/posts/{hidden.pk}/" not in urls
+
+
+@pytest.mark.django_db
+def test_sitemap_files_are_cached_and_invalidated_per_chunk(
+        client, sitemap_settings, posts, django_assert_num_queries
+):
+    first, last = posts[0], posts[-1]
+    first_url = f"/sitemap-posts-{first.pk // 2}.xml"
+    last_url = f"/sitemap-posts-{last.pk // 2}.xml"
+    read(client, "/sitemap.xml")
+    read(client, first_url)
+    read(client, last_url)
+    with django_assert_num_queries(0):
+        read(client, first_url)
+        read(client, "/sitemap.xml")
+
+    cache_dir = next(sitemap_settings.SITEMAP_ROOT.iterdir())
+    first.title = "Новый заголовок"
+    first.save()
+    files = {path.name for path in cache_dir.iterdir()}
+    assert f"posts-{first.pk // 2}.xml" not in files, (
+        "Убедитесь, что файл карты сайта сбрасывается при изменении "
+        "публикации из него."
+    )
+    assert "index.xml" not in files
+    assert f"posts-{last.pk // 2}.xml" in files, (
+        "Убедитесь, что остальные файлы карты сайта остаются в кэше."
+    )
+
+    first_pk = first.pk
+    first.delete()
+    assert f"/posts/{first_pk}/" not in read(client, first_url), (
+        "Убедитесь, что удалённая публикация пропадает из карты сайта."
+    )
+
+
+@pytest.mark.django_db
+def test_sitemap_rejects_chunks_outside_of_range(
+        client, sitemap_settings, posts
+):
+    last_chunk = posts[-1].pk // 2
+    for url in (
+        f"/sitemap-posts-{last_chunk + 1}.xml",
+        "/sitemap-posts-999999.xml",
+        "/sitemap-unknown-0.xml",
+    ):
+        assert client.get(url).status_code == 404, (
+            "Убедитесь, что номера разделов карты сайта за пределами "
+            "диапазона id возвращают 404."
+        )
+    assert not sitemap_settings.SITEMAP_ROOT.exists(), (
+        "Убедитесь, что для несуществующих разделов карты сайта "
+        "не создаются файлы."
+    )
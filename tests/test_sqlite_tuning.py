@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+from django.db import OperationalError
+from django.db.utils import ConnectionHandler
+
+from blogicum import settings_production
+
+TUNED = settings_production.SQLITE_PRAGMAS
+
+
+@pytest.fixture
+def open_connection(tmp_path, django_db_blocker):
+    opened = []
+
+    def open_connection(timeout=5):
+        connection = ConnectionHandler({"default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": str(tmp_path / "db.sqlite3"),
+            "OPTIONS": {"timeout": timeout},
+        }})["default"]
+        connection.ensure_connection()
+        opened.append(connection)
+        return connection
+
+    # Отдельные файловые базы, а не тестовая база в памяти.
+    with django_db_blocker.unblock():
+        yield open_connection
+        for connection in opened:
+            connection.close()
+
+
+def pragma(connection, name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+def test_production_pragmas_are_applied(settings, open_connection):
+    settings.SQLITE_PRAGMAS = TUNED
+    connection = open_connection()
+    assert pragma(connection, "journal_mode") == "wal"
+    assert pragma(connection, "synchronous") == 1
+    assert pragma(connection, "busy_timeout") == TUNED["busy_timeout"]
+    assert pragma(connection, "cache_size") == TUNED["cache_size"]
+    assert settings_production.DATABASES["default"]["CONN_MAX_AGE"] > 0, (
+        "Убедитесь, что в рабочем профиле соединения с базой "
+        "переиспользуются между запросами."
+    )
+
+
+def hold_write_lock(writer, started, release):
+    # Фаза фиксации записи: соединение держит блокировку на запись.
+    with writer.cursor() as cursor:
+        cursor.execute("BEGIN EXCLUSIVE")
+        cursor.execute("INSERT INTO comments (text) VALUES ('новый')")
+        started.set()
+        release.wait(5)
+        cursor.execute("COMMIT")
+
+
+def read_during_write(open_connection):
+    writer, reader = open_connection(), open_connection(timeout=0.2)
+    with writer.cursor() as cursor:
+        cursor.execute("CREATE TABLE comments (text TEXT)")
+        cursor.execute("INSERT INTO comments (text) VALUES ('старый')")
+    writer.inc_thread_sharing()
+    started, release = threading.Event(), threading.Event()
+    thread = threading.Thread(
+        target=hold_write_lock, args=(writer, started, release)
+    )
+    thread.start()
+    assert started.wait(5), "Запись не началась."
+    try:
+        begin = time.perf_counter()
+        with reader.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM comments")
+            count = cursor.fetchone()[0]
+        return count, time.perf_counter() - begin
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_readers_do_not_wait_for_comment_writes(settings, open_connection):
+    settings.SQLITE_PRAGMAS = {**TUNED, "busy_timeout": 200}
+    count, elapsed = read_during_write(open_connection)
+    assert count == 1 and elapsed < 0.1, (
+        "Убедитесь, что в режиме WAL чтение не ждёт завершения записи "
+        "и видит последнее зафиксированное состояние."
+    )
+
+
+def test_default_journal_blocks_readers(settings, open_connection):
+    settings.SQLITE_PRAGMAS = {}
+    with pytest.raises(OperationalError):
+        read_during_write(open_connection)
@@ -0,0 +1,10 @@
+from django.conf import settings
+
+from blogicum.warmup import warm_up_templates
+
+
+def test_warm_up_compiles_project_templates():
+    n_templates = len(list(settings.TEMPLATES_DIR.rglob("*.html")))
+    assert warm_up_templates() >= n_templates, (
+        "Убедитесь, что прогрев компилирует все шаблоны из `templates/`."
+    )